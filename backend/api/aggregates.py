@@ -0,0 +1,88 @@
+"""
+Incrementally maintained memo aggregates (per-month counts, words, length).
+
+Memo writes call record_memo() inside their transaction so /api/stats can
+read a few summary rows instead of scanning every memo's content.
+rebuild_month_stats() recomputes the table from scratch; the stats route
+runs it when the totals drift from COUNT(*) (first run, or memos written
+outside the API).
+"""
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import Memo, MemoMonthStats
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+def count_words(content: str) -> int:
+    """Count whitespace-separated words, ignoring HTML tags in the content."""
+    return len(TAG_PATTERN.sub(" ", content or "").split())
+
+
+def memo_delta(deltas: Dict[Tuple[int, int], List[int]], date: datetime, content: str, sign: int = 1) -> None:
+    """Accumulate one memo's contribution (sign=1 add, -1 remove) into deltas."""
+    month = deltas[(date.year, date.month)]
+    month[0] += sign
+    month[1] += sign * count_words(content)
+    month[2] += sign * len(content or "")
+
+
+async def apply_month_deltas(db: AsyncSession, deltas: Dict[Tuple[int, int], List[int]]) -> None:
+    """Add per-month (memo, word, char) deltas to the totals in one upsert."""
+    rows = [
+        {"year": year, "month": month, "memo_count": c, "word_count": w, "char_count": n}
+        for (year, month), (c, w, n) in deltas.items()
+        if c or w or n
+    ]
+    if not rows:
+        return
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    statement = insert(MemoMonthStats).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[MemoMonthStats.year, MemoMonthStats.month],
+        set_={
+            column: getattr(MemoMonthStats, column) + getattr(statement.excluded, column)
+            for column in ("memo_count", "word_count", "char_count")
+        }
+    )
+    await db.execute(statement)
+
+
+async def record_memo(db: AsyncSession, date: datetime, content: str, sign: int = 1) -> None:
+    """Add (sign=1) or remove (sign=-1) one memo from its month's totals."""
+    deltas = defaultdict(lambda: [0, 0, 0])
+    memo_delta(deltas, date, content, sign)
+    await apply_month_deltas(db, deltas)
+
+
+async def rebuild_month_stats(db: AsyncSession) -> None:
+    """Recompute every month's totals from the memos table and commit."""
+    totals = defaultdict(lambda: [0, 0, 0])
+    result = await db.stream(select(Memo.date, Memo.content).execution_options(yield_per=500))
+    async for date, content in result:
+        memo_delta(totals, date, content)
+
+    await db.execute(delete(MemoMonthStats))
+    db.add_all([
+        MemoMonthStats(year=year, month=month, memo_count=c, word_count=w, char_count=n)
+        for (year, month), (c, w, n) in totals.items()
+    ])
+    await db.commit()
+
+
+async def load_month_stats(db: AsyncSession) -> List[MemoMonthStats]:
+    """Return months that currently have memos, oldest first."""
+    result = await db.execute(
+        select(MemoMonthStats)
+        .where(MemoMonthStats.memo_count > 0)
+        .order_by(MemoMonthStats.year, MemoMonthStats.month)
+    )
+    return list(result.scalars())
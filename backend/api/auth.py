@@ -1,15 +1,25 @@
 """
 Authentication utilities for JWT token handling.
+
+Verified tokens are cached by fingerprint (token_cache) until the earlier
+of their expiry and TOKEN_CACHE_TTL_SECONDS, so repeated requests with the
+same token skip signature verification. Revoked tokens (see
+backend.api.revocation) are rejected before the cache is consulted, and
+tokens of accounts that no longer exist on every use.
 """
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from backend.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from backend.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, BCRYPT_ROUNDS
+from backend.api.cache import MISSING, token_cache
+from backend.api.revocation import is_known_user, is_revoked, token_fingerprint
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes whose cost differs from BCRYPT_ROUNDS are reported as needing an update
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 security = HTTPBearer()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -31,27 +41,45 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Verify and decode JWT token."""
-    token = credentials.credentials
+def _invalid_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def decode_token(token: str) -> Tuple[str, float]:
+    """Verify a token's signature and claims; return its subject and expiry (unix time)."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return username
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _invalid_credentials()
+    username: str = payload.get("sub")
+    if username is None:
+        raise _invalid_credentials()
+    expires = payload.get("exp")
+    if expires is None:
+        expires = time.time() + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return username, float(expires)
+
+def authenticate_token(token: str) -> Tuple[str, float]:
+    """Subject and expiry of a valid, unrevoked token, verified at most once per cache lifetime."""
+    fingerprint = token_fingerprint(token)
+    if is_revoked(fingerprint):
+        raise _invalid_credentials()
+    cached = token_cache.get(fingerprint)
+    if cached is MISSING:
+        cached = decode_token(token)
+        # Never trust a cached token past its own expiry
+        token_cache.set(fingerprint, cached, ttl=cached[1] - time.time())
+    if not is_known_user(cached[0]):
+        raise _invalid_credentials()
+    return cached
+
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Verify a bearer token and return its subject."""
+    return authenticate_token(credentials.credentials)[0]
 
 def get_current_user(username: str = Depends(verify_token)):
     """Get current authenticated user."""
     return username
-
@@ -0,0 +1,213 @@
+"""
+Bulk memo import: request parsing, up-front validation and batched upserts.
+"""
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.aggregates import apply_month_deltas, memo_delta
+from backend.api.models import Memo
+from backend.api.numbering import allocate_memo_numbers, resync_memo_numbers
+from backend.config import BULK_MAX_ITEMS
+
+# Rows per INSERT statement (keeps bound parameters well under SQLite's limit)
+BULK_CHUNK_SIZE = 500
+
+REQUIRED_FIELDS = ('title', 'content', 'date')
+TITLE_MAX_LENGTH = Memo.__table__.c.title.type.length
+
+
+def _too_many() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"At most {BULK_MAX_ITEMS} memos per bulk request"
+    )
+
+
+def _invalid_json(message: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+
+
+async def read_bulk_items(request: Request) -> list:
+    """Read a JSON array body, or an NDJSON body (one memo per line) as it streams in."""
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" not in content_type and "jsonlines" not in content_type:
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            raise _invalid_json("Body must be a JSON array of memos")
+        if not isinstance(items, list):
+            raise _invalid_json("Body must be a JSON array of memos")
+        if len(items) > BULK_MAX_ITEMS:
+            raise _too_many()
+        return items
+
+    items = []
+    buffer = b""
+    line_number = 0
+
+    def parse(line: bytes):
+        if line.strip():
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                raise _invalid_json(f"Invalid JSON on line {line_number}")
+            if len(items) > BULK_MAX_ITEMS:
+                raise _too_many()
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            parse(line)
+    line_number += 1
+    parse(buffer)
+    return items
+
+
+def memo_field_error(item: dict) -> Optional[str]:
+    """Why an item's title or content (where given) cannot be stored, or None if they can."""
+    if 'title' in item:
+        if not isinstance(item['title'], str):
+            return "title must be a string"
+        if len(item['title']) > TITLE_MAX_LENGTH:
+            return f"title must be at most {TITLE_MAX_LENGTH} characters"
+    if 'content' in item and not isinstance(item['content'], str):
+        return "content must be a string"
+    return None
+
+
+def memo_number_error(number) -> Optional[str]:
+    """Why an explicit memo_number cannot be used, or None if it can."""
+    if isinstance(number, bool) or not isinstance(number, int) or number < 1:
+        return "memo_number must be a positive integer"
+    return None
+
+
+def validate_bulk_items(items: list, parse_date: Callable) -> Tuple[List[dict], List[dict]]:
+    """
+    Validate every item before anything is written.
+
+    Returns (rows, errors); rows keep the item's index and have dates parsed.
+    Items without memo_number get ``memo_number`` None, assigned later.
+    """
+    rows, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "detail": "Item must be a JSON object"})
+            continue
+        missing = [field for field in REQUIRED_FIELDS if field not in item]
+        if missing:
+            errors.append({"index": index, "detail": f"Missing required field: {missing[0]}"})
+            continue
+        field_error = memo_field_error(item)
+        if field_error:
+            errors.append({"index": index, "detail": field_error})
+            continue
+        try:
+            date = parse_date(item['date'])
+        except (ValueError, TypeError):
+            errors.append({"index": index, "detail": "Invalid date format. Use ISO format or 'Month Day, Year'"})
+            continue
+        number = item.get('memo_number')
+        if number is not None:
+            number_error = memo_number_error(number)
+            if number_error:
+                errors.append({"index": index, "detail": number_error})
+                continue
+            if number in seen:
+                errors.append({"index": index, "detail": f"Duplicate memo_number {number} in request"})
+                continue
+            seen.add(number)
+        rows.append({
+            "index": index,
+            "memo_number": number,
+            "title": item['title'],
+            "content": item['content'],
+            "date": date
+        })
+    return rows, errors
+
+
+async def assign_memo_numbers(db: AsyncSession, rows: List[dict]) -> None:
+    """Number rows without a memo_number from the allocator, after every explicit number."""
+    unnumbered = [row for row in rows if row["memo_number"] is None]
+    explicit = [row["memo_number"] for row in rows if row["memo_number"] is not None]
+    if explicit:
+        # Move the allocator past explicit numbers so later creates don't collide
+        await resync_memo_numbers(db, floor=max(explicit))
+    if not unnumbered:
+        return
+    for row, number in zip(unnumbered, await allocate_memo_numbers(db, len(unnumbered))):
+        row["memo_number"] = number
+
+
+async def upsert_memos(db: AsyncSession, rows: List[dict], update_existing: bool) -> Dict[int, str]:
+    """
+    Insert rows with batched INSERT ... ON CONFLICT (memo_number) in the caller's transaction.
+
+    Existing memos are updated or skipped depending on ``update_existing``.
+    Keeps the month aggregates in step and returns memo_number -> status
+    ("created", "updated" or "skipped").
+    """
+    numbers = [row["memo_number"] for row in rows]
+    existing = {}
+    for start in range(0, len(numbers), BULK_CHUNK_SIZE):
+        result = await db.execute(
+            select(Memo.memo_number, Memo.date, Memo.content)
+            .where(Memo.memo_number.in_(numbers[start:start + BULK_CHUNK_SIZE]))
+        )
+        existing.update({number: (date, content) for number, date, content in result})
+
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    now = datetime.utcnow()
+    written = set()
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        values = [
+            {
+                "memo_number": row["memo_number"],
+                "title": row["title"],
+                "content": row["content"],
+                "date": row["date"],
+                "created_at": now,
+                "updated_at": now
+            }
+            for row in rows[start:start + BULK_CHUNK_SIZE]
+        ]
+        statement = insert(Memo).values(values)
+        if update_existing:
+            statement = statement.on_conflict_do_update(
+                index_elements=[Memo.memo_number],
+                set_={
+                    column: getattr(statement.excluded, column)
+                    for column in ("title", "content", "date", "updated_at")
+                }
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=[Memo.memo_number])
+        result = await db.execute(statement.returning(Memo.memo_number))
+        written.update(result.scalars())
+
+    deltas = defaultdict(lambda: [0, 0, 0])
+    statuses = {}
+    for row in rows:
+        number = row["memo_number"]
+        if number not in written:
+            statuses[number] = "skipped"
+            continue
+        if number in existing:
+            memo_delta(deltas, *existing[number], sign=-1)
+            statuses[number] = "updated"
+        else:
+            statuses[number] = "created"
+        memo_delta(deltas, row["date"], row["content"])
+    await apply_month_deltas(db, deltas)
+    return statuses
@@ -0,0 +1,271 @@
+"""
+In-process read-through cache for memo reads.
+
+Memos only change through the authenticated create/update/delete
+endpoints, so reads are cached here and those endpoints call
+invalidate_memo() after committing.
+
+Each gunicorn worker has its own caches, so writes also bump a generation
+counter in the cache_versions table (in the same transaction as the memo
+change). Read routes call sync_caches() first; a worker that sees a newer
+generation than the one its caches were filled under clears them.
+
+A read whose query overlaps a write can load the value from before the
+write and finish after the write's invalidation. Each cache counts its
+invalidations (``epoch``); loads note it first and do not store their
+result if it has moved.
+"""
+import threading
+import time
+from datetime import datetime
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import CacheVersion
+from backend.config import (
+    CACHE_ENABLED,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    CACHE_SYNC_INTERVAL,
+    COMPRESSION_CACHE_ENTRIES,
+    TOKEN_CACHE_ENTRIES,
+    TOKEN_CACHE_TTL_SECONDS
+)
+
+MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after a fixed TTL."""
+
+    def __init__(self, name: str, maxsize: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = CACHE_ENABLED
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so a load that overlapped one can tell its result may be stale
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or MISSING."""
+        if not self.enabled:
+            return MISSING
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, epoch: Optional[int] = None) -> None:
+        """
+        Store value under key (for ``ttl`` seconds if shorter than the cache's), evicting LRU entries if full.
+
+        Pass the ``epoch`` read before loading the value: if an invalidation
+        has happened since, the value may predate a write and is not stored.
+        """
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            if epoch is not None and epoch != self.epoch:
+                return
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, awaiting loader() and caching it on a miss."""
+        value = self.get(key)
+        if value is MISSING:
+            epoch = self.epoch
+            value = await loader()
+            self.set(key, value, epoch=epoch)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._data.pop(key, None)
+            self.epoch += 1
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Drop every entry for which predicate(key, value) is true."""
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+            self.epoch += 1
+
+    def discard_pending_loads(self) -> None:
+        """Keep loads already under way from storing their results (entries are kept)."""
+        with self._lock:
+            self.epoch += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+            self.epoch += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None
+        }
+
+
+# Single memos keyed by memo_number
+memo_cache = TTLCache("memo")
+# Navigation responses keyed by (memo_number, embed)
+nav_cache = TTLCache("nav")
+# Listing pages keyed by their query parameters, plus the total count
+list_cache = TTLCache("list")
+# Aggregate statistics
+stats_cache = TTLCache("stats")
+# Compressed bodies keyed by (path, query, encoding, ETag), filled by the compression middleware
+compressed_cache = TTLCache("compressed", maxsize=COMPRESSION_CACHE_ENTRIES)
+compressed_cache.enabled = CACHE_ENABLED and COMPRESSION_CACHE_ENTRIES > 0
+
+# Verified access tokens keyed by token fingerprint; see backend.api.auth
+token_cache = TTLCache("tokens", maxsize=TOKEN_CACHE_ENTRIES, ttl=TOKEN_CACHE_TTL_SECONDS)
+token_cache.enabled = TOKEN_CACHE_ENTRIES > 0
+
+# Caches of memo data, cleared together when another worker writes
+MEMO_CACHES = (memo_cache, nav_cache, list_cache, stats_cache, compressed_cache)
+CACHES = MEMO_CACHES + (token_cache,)
+
+# Row in cache_versions covering every memo cache
+MEMO_CACHE_VERSION = "memos"
+
+# Generation the local caches were filled under (None until first sync)
+_generation = None
+_last_sync = 0.0
+_sync_lock = threading.Lock()
+
+
+def _clear_all() -> None:
+    for cache in MEMO_CACHES:
+        cache.clear()
+
+
+async def sync_caches(db: AsyncSession) -> None:
+    """Clear local caches if another worker has written since they were filled."""
+    global _generation, _last_sync
+    if not CACHE_ENABLED:
+        return
+    now = time.monotonic()
+    if CACHE_SYNC_INTERVAL and now - _last_sync < CACHE_SYNC_INTERVAL:
+        return
+    version = await db.scalar(
+        select(CacheVersion.version).where(CacheVersion.name == MEMO_CACHE_VERSION)
+    ) or 0
+    with _sync_lock:
+        if version != _generation:
+            _clear_all()
+            _generation = version
+        _last_sync = now
+
+
+async def bump_generation(db: AsyncSession, name: str = MEMO_CACHE_VERSION) -> int:
+    """
+    Increment a shared generation counter inside the caller's transaction.
+
+    Returns the new generation; for the memo caches, pass it to
+    invalidate_memo() after commit.
+    """
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == name)
+        .values(version=CacheVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        db.add(CacheVersion(name=name, version=1, updated_at=now))
+        await db.flush()
+    return await db.scalar(
+        select(CacheVersion.version).where(CacheVersion.name == name)
+    )
+
+
+def _advance_generation(generation: Optional[int]) -> None:
+    """
+    Adopt the generation of a local write if it directly follows ours.
+
+    Only safe because reads still loading from before the write can no
+    longer store their results: otherwise one could put a stale value back
+    after the write's invalidation, and the next sync would see nothing
+    new to clear.
+    """
+    global _generation
+    if generation is None:
+        return
+    with _sync_lock:
+        if _generation is not None and generation == _generation + 1:
+            for cache in MEMO_CACHES:
+                cache.discard_pending_loads()
+            _generation = generation
+
+
+def _nav_affected(memo_number: int, nav) -> bool:
+    """Whether a cached MemoNavigation could change when memo_number is written."""
+    current = nav.current.memo_number
+    previous = nav.previous.memo_number if nav.previous else None
+    following = nav.next.memo_number if nav.next else None
+    if memo_number in (current, previous, following):
+        return True
+    # A memo inserted between the current memo and a neighbour becomes the new neighbour
+    lower = previous if previous is not None else float("-inf")
+    upper = following if following is not None else float("inf")
+    return lower < memo_number < upper
+
+
+def invalidate_memo(memo_number: int, generation: Optional[int] = None) -> None:
+    """
+    Invalidate everything a write to memo_number can change.
+
+    ``generation`` is the value returned by bump_generation() for this write.
+    If it directly follows the local generation, no other worker has written
+    in between, so the precise invalidation here is enough and the local
+    generation moves forward without a full clear on the next sync.
+    """
+    memo_cache.delete(memo_number)
+    nav_cache.delete_where(lambda key, nav: _nav_affected(memo_number, nav))
+    # Any write can reorder listings and change the aggregates
+    list_cache.clear()
+    stats_cache.clear()
+    _advance_generation(generation)
+
+
+def invalidate_all(generation: Optional[int] = None) -> None:
+    """Invalidate every cache after a write touching many memos (bulk import)."""
+    _clear_all()
+    _advance_generation(generation)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Counters for every cache, keyed by cache name, plus the local generation."""
+    stats: Dict[str, Any] = {cache.name: cache.stats() for cache in CACHES}
+    stats["generation"] = _generation
+    return stats
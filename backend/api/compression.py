@@ -0,0 +1,207 @@
+"""
+Response compression middleware (brotli and gzip).
+
+Responses are compressed when the client accepts an encoding, the content
+type is on the allowlist and the body reaches the minimum size. Streamed
+bodies (the NDJSON export) are compressed chunk by chunk. Compressed
+bodies of ETagged responses are kept in ``compressed_cache`` keyed by URL,
+encoding and ETag, so hot pages such as the first listing page are
+compressed once per change rather than on every request. A 304 carries
+the same Vary and, when the client revalidates a compressed copy, the
+same encoded ETag as the 200 it stands for.
+"""
+import zlib
+from typing import Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.api.cache import MISSING, compressed_cache
+from backend.api.http_cache import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, or None."""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    def allowed(encoding: str) -> bool:
+        return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._compress = self._compressor.process
+            self._flush = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # gzip container
+            self._compress = self._compressor.compress
+            self._flush = self._compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def flush(self) -> bytes:
+        return self._flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible responses with brotli or gzip."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        content_types: Sequence[str] = ("application/json",),
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(t.strip().lower() for t in content_types if t.strip())
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, scope, encoding)(receive, send)
+
+
+class _CompressionResponder:
+    """Per-request state: holds back the response start until the body is seen."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.middleware.app(self.scope, receive, self.send_message)
+
+    def _eligible(self, headers: MutableHeaders) -> bool:
+        if self.start["status"] < 200 or self.start["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.middleware.content_types
+
+    def _compressed_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        if "etag" in headers:
+            # A compressed body is a different representation: give it its own ETag
+            headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+
+    def _not_modified_headers(self, headers: MutableHeaders) -> None:
+        """Give a 304 the Vary and ETag of the representation the client revalidated."""
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" not in headers:
+            return
+        # Small bodies go out uncompressed, so the 200 only had the encoded
+        # ETag if that is what the client holds and sent back
+        encoded = encoded_etag(headers["etag"], self.encoding)
+        if_none_match = Headers(scope=self.scope).get("if-none-match", "")
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if encoded in tags or "W/" + encoded in tags:
+            headers["ETag"] = encoded
+
+    def _cache_key(self, headers: MutableHeaders):
+        if self.scope["method"] != "GET" or self.start["status"] != 200 or "etag" not in headers:
+            return None
+        return (self.scope["path"], self.scope.get("query_string", b""), self.encoding, headers["etag"])
+
+    def _new_compressor(self) -> _Compressor:
+        return _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+
+    async def send_message(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            # Streaming: headers are already out
+            data = self.compressor.compress(body)
+            if not more_body:
+                data += self.compressor.flush()
+            if data or not more_body:
+                await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        if self.start["status"] == 304 and "content-encoding" not in headers:
+            self._not_modified_headers(headers)
+        if not self._eligible(headers):
+            self.passthrough = True
+            await self.send(self.start)
+            await self.send(message)
+            return
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body:
+            if len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            key = self._cache_key(headers)
+            compressed = compressed_cache.get(key) if key is not None else MISSING
+            if compressed is MISSING:
+                compressor = self._new_compressor()
+                compressed = compressor.compress(body) + compressor.flush()
+                if key is not None:
+                    compressed_cache.set(key, compressed)
+            self._compressed_headers(headers)
+            headers["Content-Length"] = str(len(compressed))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+
+        # Streamed body of unknown length: compress as it goes
+        self.compressor = self._new_compressor()
+        self._compressed_headers(headers)
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        await self.send(self.start)
+        data = self.compressor.compress(body)
+        if data:
+            await self.send({"type": "http.response.body", "body": data, "more_body": True})
@@ -2,10 +2,33 @@
 Database configuration and session management.
 """
 import os
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
+from fastapi import HTTPException, status
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from backend.config import DATABASE_URL, BASE_DIR
+from sqlalchemy.pool import NullPool, StaticPool
+from backend.config import (
+    BASE_DIR,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_CLASS,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLITE_READ_POOL_SIZE
+)
+from backend.api.sqlite_tuning import (
+    install_pragmas,
+    is_memory_database,
+    is_sqlite,
+    use_immediate_transactions
+)
+from backend.api.instrumentation import install_query_hooks
 
 # Prepare connection args based on database type
 connect_args = {}
@@ -37,33 +60,182 @@ elif 'postgresql' in DATABASE_URL or 'postgres' in DATABASE_URL:
     # No special connect_args needed for PostgreSQL
     pass
 
-# Create engine with appropriate configuration
+def _pool_options(url: str) -> dict:
+    """Pool arguments for create_engine/create_async_engine, per dialect and config."""
+    pool_class = DB_POOL_CLASS
+    if not pool_class:
+        # In-memory databases exist per connection, so share one
+        pool_class = "static" if is_sqlite(url) and is_memory_database(url) else "queue"
+    if pool_class == "static":
+        return {"poolclass": StaticPool}
+    if pool_class == "null":
+        return {"poolclass": NullPool}
+    if is_sqlite(url):
+        # Read pool: keeps connections warm (pragmas applied, page cache filled);
+        # a local file needs no pings or recycling
+        return {
+            "pool_size": SQLITE_READ_POOL_SIZE,
+            "max_overflow": SQLITE_READ_POOL_SIZE,
+            "pool_timeout": DB_POOL_TIMEOUT
+        }
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING  # Verify connections before using (important for PostgreSQL)
+    }
+
+# Sync engine for init_db and the scripts: short-lived sessions, so no idle pool
 engine = create_engine(
     DATABASE_URL,
     connect_args=connect_args,
-    pool_pre_ping=True,  # Verify connections before using (important for PostgreSQL)
-    pool_size=5,  # Connection pool size for PostgreSQL
-    max_overflow=10  # Max overflow connections
+    poolclass=NullPool
 )
 
-# Create session factory
+# Create session factory (scripts and init_db)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def get_db():
-    """Get database session (dependency for FastAPI)."""
-    db = SessionLocal()
-    try:
+def _async_database_url(url: str) -> str:
+    """Map DATABASE_URL onto the asyncio driver for the same database."""
+    if url.startswith('sqlite:'):
+        return url.replace('sqlite:', 'sqlite+aiosqlite:', 1)
+    if url.startswith('postgresql+psycopg2:'):
+        return url.replace('postgresql+psycopg2:', 'postgresql+psycopg:', 1)
+    # postgresql+psycopg (psycopg3) has a native asyncio mode
+    return url
+
+ASYNC_DATABASE_URL = _async_database_url(DATABASE_URL)
+
+# Async engine used by the API routes so queries never block the event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_pool_options(ASYNC_DATABASE_URL))
+
+# Engine for write routes. On an SQLite file this is one serialized writer
+# connection per worker (BEGIN IMMEDIATE), separate from the read pool, so
+# writes queue here instead of contending for the file lock; elsewhere it
+# is the same engine
+if is_sqlite(ASYNC_DATABASE_URL) and not is_memory_database(ASYNC_DATABASE_URL) and not DB_POOL_CLASS:
+    write_engine = create_async_engine(
+        ASYNC_DATABASE_URL, pool_size=1, max_overflow=0, pool_timeout=DB_POOL_TIMEOUT
+    )
+    use_immediate_transactions(write_engine.sync_engine)
+else:
+    write_engine = async_engine
+
+if is_sqlite(DATABASE_URL):
+    # WAL, synchronous=NORMAL, mmap, page cache and busy timeout on every connection
+    install_pragmas(engine)
+    install_pragmas(async_engine.sync_engine)
+    if write_engine is not async_engine:
+        install_pragmas(write_engine.sync_engine)
+
+# Count and time statements per request (Server-Timing, slow query log)
+install_query_hooks(engine)
+install_query_hooks(async_engine.sync_engine)
+if write_engine is not async_engine:
+    install_query_hooks(write_engine.sync_engine)
+
+# expire_on_commit=False: attributes must not lazy-load after commit under asyncio
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+WriteSessionLocal = async_sessionmaker(
+    write_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Connection checkouts by get_db: how many found the pool exhausted and how long they waited
+pool_waits = {"checkouts": 0, "waits": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0, "timeouts": 0}
+
+def _pool_exhausted(pool) -> bool:
+    """Whether a checkout right now would have to wait for a connection to be returned."""
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "_max_overflow"):
+        return False
+    if pool._max_overflow < 0:  # unlimited overflow
+        return False
+    return pool.checkedin() == 0 and pool.checkedout() >= pool.size() + pool._max_overflow
+
+def pool_stats() -> dict:
+    """Current state of the API's connection pool plus checkout wait counters."""
+    pool = async_engine.pool
+    stats = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    if "overflow" in stats:
+        # QueuePool reports unused pool slots as negative overflow
+        stats["overflow"] = max(stats["overflow"], 0)
+    if getattr(pool, "_max_overflow", -1) >= 0 and "size" in stats:
+        stats["capacity"] = stats["size"] + pool._max_overflow
+    stats.update(pool_waits)
+    return stats
+
+@asynccontextmanager
+async def _checked_out_session(session_factory, pool):
+    """Open a session and check its connection out up front, timing any wait on the pool."""
+    async with session_factory() as db:
+        exhausted = _pool_exhausted(pool)
+        start = time.perf_counter()
+        try:
+            await db.connection()
+        except PoolTimeoutError:
+            pool_waits["timeouts"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database is busy, please retry",
+                headers={"Retry-After": "1"}
+            )
+        pool_waits["checkouts"] += 1
+        if exhausted:
+            waited = time.perf_counter() - start
+            pool_waits["waits"] += 1
+            pool_waits["wait_seconds"] += waited
+            pool_waits["max_wait_seconds"] = max(pool_waits["max_wait_seconds"], waited)
+        yield db
+
+async def get_db():
+    """Get async database session (dependency for FastAPI)."""
+    async with _checked_out_session(AsyncSessionLocal, async_engine.pool) as db:
+        yield db
+
+async def get_write_db():
+    """Get async database session for routes that write (dependency for FastAPI)."""
+    async with _checked_out_session(WriteSessionLocal, write_engine.pool) as db:
         yield db
-    finally:
-        db.close()
 
 def init_db():
     """Initialize the database by creating all tables."""
     from backend.api.models import Base
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all only builds indexes with new tables; backfill indexes
+        # added to models after the table already existed
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        from backend.api.numbering import init_memo_numbering
+        with engine.begin() as connection:
+            init_memo_numbering(connection)
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"Error creating database tables: {e}")
         raise
+
+    # Admin account from ADMIN_USERNAME/ADMIN_PASSWORD
+    from backend.api.users import ensure_admin_user
+    try:
+        ensure_admin_user(engine)
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Could not create the admin user: {e}")
+
+    # Full-text search index (search is unavailable, not fatal, if this fails)
+    from backend.api.search import init_search_index
+    try:
+        with engine.begin() as connection:
+            init_search_index(connection)
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(f"Could not create full-text search index: {e}")
@@ -0,0 +1,63 @@
+"""
+Readiness probe: database round trip and connection pool saturation.
+
+The probe runs ``SELECT 1`` through the same pool the API uses, bounded by
+HEALTH_CHECK_TIMEOUT, so an exhausted pool or an unreachable database
+shows up as a failed (timed out) check. Results are reused for
+HEALTH_CHECK_CACHE_SECONDS and concurrent probes share one check, so
+frequent health checks do not load the database themselves.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from backend.api.database import async_engine, pool_stats
+from backend.config import HEALTH_CHECK_CACHE_SECONDS, HEALTH_CHECK_TIMEOUT
+
+_result: Optional[Dict[str, Any]] = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def _ping() -> None:
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def _check() -> Dict[str, Any]:
+    start = time.perf_counter()
+    error = None
+    try:
+        await asyncio.wait_for(_ping(), timeout=HEALTH_CHECK_TIMEOUT)
+    except asyncio.TimeoutError:
+        error = f"Database did not answer within {HEALTH_CHECK_TIMEOUT:g}s"
+    except Exception as e:
+        error = f"Database error: {type(e).__name__}"
+    latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    pool = pool_stats()
+    saturation = None
+    if pool.get("capacity"):
+        saturation = round(pool["checkedout"] / pool["capacity"], 3)
+
+    result = {
+        "status": "ready" if error is None else "unavailable",
+        "database": {"ok": error is None, "latency_ms": latency_ms},
+        "pool": {**pool, "saturation": saturation},
+        "checked_at": time.time()
+    }
+    if error is not None:
+        result["database"]["error"] = error
+    return result
+
+
+async def check_readiness() -> Dict[str, Any]:
+    """Return the cached readiness result, re-checking once it is older than the cache interval."""
+    global _result, _checked_at
+    async with _lock:
+        if _result is None or time.monotonic() - _checked_at >= HEALTH_CHECK_CACHE_SECONDS:
+            _result = await _check()
+            _checked_at = time.monotonic()
+        return _result
@@ -0,0 +1,124 @@
+"""
+HTTP conditional request helpers (ETag / Last-Modified / 304).
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.cache import MEMO_CACHE_VERSION, list_cache
+from backend.api.models import CacheVersion, Memo
+from backend.config import HTTP_CACHE_MAX_AGE
+
+
+def cache_control() -> str:
+    """Cache-Control policy for public memo reads."""
+    if HTTP_CACHE_MAX_AGE > 0:
+        return f"public, max-age={HTTP_CACHE_MAX_AGE}"
+    # Let browsers/CDNs store responses but revalidate (cheap 304s) every time
+    return "public, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values that determine a representation."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+async def collection_validators(db: AsyncSession) -> Tuple[int, Optional[datetime]]:
+    """
+    Return (memo count, last write time) for the whole diary.
+
+    The last write time is the later of the newest updated_at and the time
+    the memo cache generation was last bumped, which every write including
+    a delete does. Any write changes one of the two values, so they
+    fingerprint every listing, nav and stats response. Cached until the next
+    write.
+    """
+    async def load():
+        bumped = (
+            select(CacheVersion.updated_at)
+            .where(CacheVersion.name == MEMO_CACHE_VERSION)
+            .scalar_subquery()
+        )
+        total, latest, written = (await db.execute(
+            select(func.count(Memo.id), func.max(Memo.updated_at), bumped)
+        )).one()
+        return total, max((t for t in (latest, written) if t is not None), default=None)
+
+    return await list_cache.get_or_load("fingerprint", load)
+
+
+# Suffixes the compression middleware adds to ETags of encoded bodies
+ENCODING_ETAG_SUFFIXES = {"gzip": "-gzip", "br": "-br"}
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag for the ``encoding``-compressed form of a representation ("abc" -> "abc-br")."""
+    return etag[:-1] + ENCODING_ETAG_SUFFIXES[encoding] + '"'
+
+
+def _strip_encoding(tag: str) -> str:
+    for suffix in ENCODING_ETAG_SUFFIXES.values():
+        if tag.endswith(suffix + '"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _settled(last_modified: Optional[datetime]) -> bool:
+    """
+    Whether last_modified is usable as a validator (RFC 7232, 2.2.2).
+
+    HTTP dates have one-second resolution, so a second in which a write
+    happened only identifies one version once it is over; until then a
+    second write could follow under the same date.
+    """
+    if last_modified is None:
+        return False
+    return last_modified.replace(microsecond=0) < datetime.utcnow().replace(microsecond=0)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match uses weak comparison, which also matches compressed forms
+        return "*" in candidates or etag in [
+            _strip_encoding(tag[2:] if tag.startswith("W/") else tag) for tag in candidates
+        ]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and _settled(last_modified):
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        return modified <= since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    """Attach ETag, Last-Modified (once settled) and Cache-Control to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control()
+    if _settled(last_modified):
+        response.headers["Last-Modified"] = _http_date(last_modified)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Build an empty 304 response carrying the current validators."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
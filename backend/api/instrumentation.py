@@ -0,0 +1,199 @@
+"""
+Per-request timing and SQL query instrumentation.
+
+TimingMiddleware measures every request and keeps a latency histogram per
+route template. SQLAlchemy cursor events (install_query_hooks) add each
+statement's count and duration to the metrics of the request that issued
+it, which is found through a context variable. Responses carry a
+``Server-Timing`` header (``db`` and ``app`` durations, query count),
+and requests or statements slower than the configured thresholds are
+logged.
+"""
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.config import SERVER_TIMING_ENABLED, SLOW_QUERY_MS, SLOW_REQUEST_MS
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (milliseconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class RequestMetrics:
+    """Statement count and database time accumulated by one request."""
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+_current: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    "request_metrics", default=None
+)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Metrics of the request being handled, or None outside a request."""
+    return _current.get()
+
+
+class RouteStats:
+    """Latency histogram and query totals for one route."""
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.statuses: Dict[int, int] = {}
+
+    def observe(self, elapsed_ms: float, metrics: RequestMetrics, status_code: int) -> None:
+        index = 0
+        while index < len(LATENCY_BUCKETS_MS) and elapsed_ms > LATENCY_BUCKETS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.db_ms += metrics.db_time * 1000
+        self.queries += metrics.queries
+        self.max_queries = max(self.max_queries, metrics.queries)
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, observed in zip([*LATENCY_BUCKETS_MS, "+Inf"], self.buckets):
+            cumulative += observed
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "average_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "average_db_ms": round(self.db_ms / self.count, 2) if self.count else None,
+            "average_queries": round(self.queries / self.count, 2) if self.count else None,
+            "max_queries": self.max_queries,
+            "latency_buckets_ms": buckets
+        }
+
+
+# Keyed by (method, route template)
+_routes: Dict[tuple, RouteStats] = {}
+_routes_lock = threading.Lock()
+
+
+def record_request(
+    method: str,
+    route: str,
+    elapsed_ms: float,
+    metrics: RequestMetrics,
+    status_code: int
+) -> None:
+    """Add one finished request to its route's statistics."""
+    with _routes_lock:
+        stats = _routes.get((method, route))
+        if stats is None:
+            stats = _routes[(method, route)] = RouteStats()
+        stats.observe(elapsed_ms, metrics, status_code)
+
+
+def request_stats() -> Dict[str, Any]:
+    """Per-route statistics keyed by "METHOD /route/template"."""
+    with _routes_lock:
+        return {f"{method} {route}": stats.snapshot() for (method, route), stats in sorted(_routes.items())}
+
+
+def raw_route_stats() -> List[Dict[str, Any]]:
+    """Raw per-route counters (for /metrics, which sums them across workers)."""
+    with _routes_lock:
+        return [
+            {
+                "method": method,
+                "route": route,
+                "buckets": list(stats.buckets),
+                "count": stats.count,
+                "total_ms": stats.total_ms,
+                "db_ms": stats.db_ms,
+                "queries": stats.queries,
+                "statuses": {str(code): n for code, n in stats.statuses.items()}
+            }
+            for (method, route), stats in _routes.items()
+        ]
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Count and time every statement run on ``engine`` (use ``.sync_engine`` for async engines)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.db_time += elapsed
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {' '.join(statement.split())[:500]}")
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one entry so scanners cannot grow the registry
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class TimingMiddleware:
+    """ASGI middleware recording latency, query count and DB time per request."""
+
+    def __init__(self, app: ASGIApp, server_timing: bool = SERVER_TIMING_ENABLED):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries", '
+                        f'app;dur={elapsed_ms:.2f}'
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            route = _route_template(scope)
+            record_request(scope["method"], route, elapsed_ms, metrics, status_code)
+            if elapsed_ms >= SLOW_REQUEST_MS:
+                logger.warning(
+                    f"Slow request: {scope['method']} {route} -> {status_code} in {elapsed_ms:.1f} ms "
+                    f"({metrics.queries} queries, {metrics.db_time * 1000:.1f} ms in DB)"
+                )
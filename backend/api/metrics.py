@@ -0,0 +1,212 @@
+"""
+Prometheus text exposition of request, pool, cache and memory metrics.
+
+Gunicorn runs several workers, each with its own counters, and a scrape
+reaches only one of them. Every worker therefore writes a JSON snapshot
+of its counters to METRICS_DIR (shared by the workers of one master)
+every METRICS_FLUSH_INTERVAL seconds, and /metrics sums the snapshots of
+all workers. Counters and histograms of workers that have exited are
+kept so totals never go backwards; their gauges (pool, memory) are
+dropped.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from backend.api.cache import CACHES
+from backend.api.database import pool_stats
+from backend.api.instrumentation import LATENCY_BUCKETS_MS, raw_route_stats
+from backend.config import METRICS_DIR, METRICS_FLUSH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+def _resident_memory_bytes() -> int:
+    """Current RSS from /proc, or peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def collect_snapshot() -> Dict[str, Any]:
+    """This worker's counters and gauges."""
+    return {
+        "pid": os.getpid(),
+        "time": time.time(),
+        "routes": raw_route_stats(),
+        "pool": pool_stats(),
+        "caches": {cache.name: cache.stats() for cache in CACHES},
+        "resident_memory_bytes": _resident_memory_bytes()
+    }
+
+
+def write_snapshot() -> None:
+    """Atomically replace this worker's snapshot file."""
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, f"worker-{os.getpid()}.json")
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(collect_snapshot(), f)
+    os.replace(temporary, path)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_snapshots() -> List[Dict[str, Any]]:
+    """Snapshots of every worker, with this worker's taken fresh."""
+    snapshots = [collect_snapshot()]
+    try:
+        names = os.listdir(METRICS_DIR)
+    except FileNotFoundError:
+        return snapshots
+    for name in names:
+        if not (name.startswith("worker-") and name.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, name)) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if snapshot.get("pid") == os.getpid():
+            continue
+        snapshot["alive"] = _alive(snapshot.get("pid", 0))
+        snapshots.append(snapshot)
+    return snapshots
+
+
+async def run_flusher() -> None:
+    """Write this worker's snapshot periodically (started on app startup)."""
+    while True:
+        try:
+            write_snapshot()
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+
+
+def _labels(**labels) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_metrics(snapshots: List[Dict[str, Any]]) -> str:
+    """Sum worker snapshots into the Prometheus text format."""
+    requests = defaultdict(int)
+    histograms = defaultdict(lambda: {"buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1), "count": 0, "sum": 0.0})
+    db_time = defaultdict(float)
+    queries = defaultdict(int)
+    caches = defaultdict(lambda: defaultdict(int))
+    pool = defaultdict(float)
+    memory = 0
+    workers = 0
+
+    for snapshot in snapshots:
+        for route in snapshot.get("routes", []):
+            key = (route["method"], route["route"])
+            for code, count in route["statuses"].items():
+                requests[key + (code,)] += count
+            histogram = histograms[key]
+            histogram["buckets"] = [a + b for a, b in zip(histogram["buckets"], route["buckets"])]
+            histogram["count"] += route["count"]
+            histogram["sum"] += route["total_ms"] / 1000
+            db_time[key] += route["db_ms"] / 1000
+            queries[key] += route["queries"]
+        for name, counters in snapshot.get("caches", {}).items():
+            for counter in ("hits", "misses", "evictions"):
+                caches[name][counter] += counters[counter]
+            if snapshot.get("alive", True):
+                caches[name]["size"] += counters["size"]
+        stats = snapshot.get("pool", {})
+        for counter in ("checkouts", "waits", "wait_seconds", "timeouts"):
+            pool[counter] += stats.get(counter, 0)
+        pool["max_wait_seconds"] = max(pool["max_wait_seconds"], stats.get("max_wait_seconds", 0))
+        if snapshot.get("alive", True):
+            workers += 1
+            memory += snapshot.get("resident_memory_bytes", 0)
+            for gauge in ("size", "checkedin", "checkedout", "overflow"):
+                pool[gauge] += stats.get(gauge, 0)
+
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+
+    metric("diary_http_requests_total", "counter", "HTTP requests by route and status.", [
+        f"diary_http_requests_total{_labels(method=m, route=r, status=s)} {n}"
+        for (m, r, s), n in sorted(requests.items())
+    ])
+    samples = []
+    for (method, route), histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, observed in zip([*LATENCY_BUCKETS_MS, None], histogram["buckets"]):
+            cumulative += observed
+            le = "+Inf" if bound is None else f"{bound / 1000:g}"
+            samples.append(
+                f"diary_http_request_duration_seconds_bucket{_labels(method=method, route=route, le=le)} {cumulative}"
+            )
+        labels = _labels(method=method, route=route)
+        samples.append(f"diary_http_request_duration_seconds_sum{labels} {histogram['sum']:.6f}")
+        samples.append(f"diary_http_request_duration_seconds_count{labels} {histogram['count']}")
+    metric("diary_http_request_duration_seconds", "histogram", "HTTP request latency by route.", samples)
+    metric("diary_db_queries_total", "counter", "SQL statements issued by requests, by route.", [
+        f"diary_db_queries_total{_labels(method=m, route=r)} {n}" for (m, r), n in sorted(queries.items())
+    ])
+    metric("diary_db_time_seconds_total", "counter", "Time requests spent executing SQL, by route.", [
+        f"diary_db_time_seconds_total{_labels(method=m, route=r)} {t:.6f}" for (m, r), t in sorted(db_time.items())
+    ])
+
+    for gauge, help_text in (
+        ("size", "Configured connection pool size, summed over workers."),
+        ("checkedin", "Idle pooled connections."),
+        ("checkedout", "Connections currently checked out."),
+        ("overflow", "Connections opened beyond the pool size."),
+    ):
+        metric(f"diary_db_pool_{gauge}", "gauge", help_text, [f"diary_db_pool_{gauge} {pool[gauge]:g}"])
+    metric("diary_db_pool_checkouts_total", "counter", "Connections checked out for requests.",
+           [f"diary_db_pool_checkouts_total {pool['checkouts']:g}"])
+    metric("diary_db_pool_waits_total", "counter", "Checkouts that found the pool exhausted and waited.",
+           [f"diary_db_pool_waits_total {pool['waits']:g}"])
+    metric("diary_db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection.",
+           [f"diary_db_pool_wait_seconds_total {pool['wait_seconds']:.6f}"])
+    metric("diary_db_pool_max_wait_seconds", "gauge", "Longest single wait for a pooled connection.",
+           [f"diary_db_pool_max_wait_seconds {pool['max_wait_seconds']:.6f}"])
+    metric("diary_db_pool_timeouts_total", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT (503s).",
+           [f"diary_db_pool_timeouts_total {pool['timeouts']:g}"])
+
+    for counter in ("hits", "misses", "evictions"):
+        metric(f"diary_cache_{counter}_total", "counter", f"Read cache {counter}, by cache.", [
+            f"diary_cache_{counter}_total{_labels(cache=name)} {values[counter]}"
+            for name, values in sorted(caches.items())
+        ])
+    metric("diary_cache_entries", "gauge", "Entries held by each read cache.", [
+        f"diary_cache_entries{_labels(cache=name)} {values['size']}" for name, values in sorted(caches.items())
+    ])
+    ratios = []
+    for name, values in sorted(caches.items()):
+        lookups = values["hits"] + values["misses"]
+        if lookups:
+            ratios.append(f"diary_cache_hit_ratio{_labels(cache=name)} {values['hits'] / lookups:.4f}")
+    metric("diary_cache_hit_ratio", "gauge", "Hits over lookups since the workers started.", ratios)
+
+    metric("diary_workers", "gauge", "Live worker processes reporting metrics.", [f"diary_workers {workers}"])
+    metric("diary_process_resident_memory_bytes", "gauge", "Resident memory of all live workers.",
+           [f"diary_process_resident_memory_bytes {memory}"])
+    return "\n".join(lines) + "\n"
@@ -1,7 +1,7 @@
 """
 Database models for the memo system.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, Boolean, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -17,8 +17,13 @@ class Memo(Base):
     content = Column(Text, nullable=False)
     date = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        # Covers the listing order (date, memo_number) so keyset pages seek directly
+        Index('ix_memos_date_memo_number', 'date', 'memo_number'),
+    )
+
     def to_dict(self):
         """Convert memo to dictionary for JSON serialization."""
         return {
@@ -31,6 +36,82 @@ class Memo(Base):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
+    @classmethod
+    def summary_columns(cls, excerpt: int = 0):
+        """Columns selected for list summaries (no full content); see schemas.MemoSummary."""
+        columns = [cls.id, cls.memo_number, cls.title, cls.date]
+        if excerpt > 0:
+            columns.append(func.substr(cls.content, 1, excerpt).label('excerpt'))
+        return columns
+    
     def __repr__(self):
         return f"<Memo(memo_number={self.memo_number}, title='{self.title}', date={self.date})>"
 
+class CacheVersion(Base):
+    """Generation counter shared by all workers to invalidate their read caches."""
+    __tablename__ = 'cache_versions'
+    
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)  # time of the last bump, so deletes also move Last-Modified
+    
+    def __repr__(self):
+        return f"<CacheVersion(name='{self.name}', version={self.version})>"
+
+class MemoMonthStats(Base):
+    """Per-month memo, word and character totals, maintained on every memo write."""
+    __tablename__ = 'memo_month_stats'
+    
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    memo_count = Column(Integer, nullable=False, default=0)
+    word_count = Column(Integer, nullable=False, default=0)
+    char_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<MemoMonthStats(year={self.year}, month={self.month}, memo_count={self.memo_count})>"
+
+class MemoCounter(Base):
+    """Atomic counters (memo number allocation on SQLite; PostgreSQL uses a sequence)."""
+    __tablename__ = 'memo_counters'
+    
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<MemoCounter(name='{self.name}', value={self.value})>"
+
+class RevokedToken(Base):
+    """Access tokens revoked by logout, kept until they would have expired anyway."""
+    __tablename__ = 'revoked_tokens'
+    
+    token_hash = Column(String(64), primary_key=True)  # SHA-256 hex digest, never the token itself
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<RevokedToken(token_hash='{self.token_hash[:12]}...', expires_at={self.expires_at})>"
+
+class RateLimitBucket(Base):
+    """Token bucket of one client, shared by all workers when RATE_LIMIT_STORE is 'database'."""
+    __tablename__ = 'rate_limit_buckets'
+    
+    key = Column(String(200), primary_key=True)  # "<limiter>:<client ip>"
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)  # unix time of the last refill
+    
+    def __repr__(self):
+        return f"<RateLimitBucket(key='{self.key}', tokens={self.tokens:.2f})>"
+
+class User(Base):
+    """Account that can sign in and edit memos; see backend.api.users."""
+    __tablename__ = 'users'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    username = Column(String(150), unique=True, nullable=False, index=True)
+    hashed_password = Column(String(255), nullable=False)  # bcrypt, cost from BCRYPT_ROUNDS
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<User(username='{self.username}')>"
@@ -0,0 +1,101 @@
+"""
+Atomic memo number allocation.
+
+PostgreSQL draws numbers from the ``memo_number_seq`` sequence, evaluated
+inside the INSERT itself. SQLite increments a row in ``memo_counters``
+(the UPDATE holds the database write lock until commit). Numbers supplied
+explicitly can overtake the counter, so a conflicting insert calls
+resync_memo_numbers() and retries.
+"""
+from typing import List
+
+from sqlalchemy import func, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.models import MemoCounter
+
+MEMO_NUMBER_SEQUENCE = "memo_number_seq"
+MEMO_NUMBER_COUNTER = "memo_number"
+
+# Attempts to insert a memo with an allocated number before giving up
+MEMO_NUMBER_ATTEMPTS = 3
+
+PG_CREATE_SEQUENCE = f"CREATE SEQUENCE IF NOT EXISTS {MEMO_NUMBER_SEQUENCE}"
+
+# Move the sequence past max(memo_number) and :floor, never backwards
+PG_RESYNC = f"""
+SELECT setval('{MEMO_NUMBER_SEQUENCE}', target, false)
+FROM (SELECT GREATEST(COALESCE((SELECT MAX(memo_number) FROM memos), 0), :floor) + 1 AS target) AS t
+WHERE target > (
+    SELECT CASE WHEN is_called THEN last_value + 1 ELSE last_value END FROM {MEMO_NUMBER_SEQUENCE}
+)
+"""
+
+SQLITE_RESYNC = [
+    f"INSERT OR IGNORE INTO memo_counters (name, value) VALUES ('{MEMO_NUMBER_COUNTER}', 0)",
+    "UPDATE memo_counters SET value = MAX(value, :floor, "
+    "(SELECT COALESCE(MAX(memo_number), 0) FROM memos)) "
+    f"WHERE name = '{MEMO_NUMBER_COUNTER}'",
+]
+
+
+def _resync_statements(dialect: str) -> List[str]:
+    return [PG_RESYNC] if dialect == "postgresql" else SQLITE_RESYNC
+
+
+def init_memo_numbering(connection: Connection) -> None:
+    """Create the sequence/counter and move it past existing memo numbers."""
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(PG_CREATE_SEQUENCE))
+    for statement in _resync_statements(connection.dialect.name):
+        connection.execute(text(statement), {"floor": 0})
+
+
+async def resync_memo_numbers(db: AsyncSession, floor: int = 0) -> None:
+    """Move the allocator past the highest memo number (and ``floor``)."""
+    for statement in _resync_statements(db.bind.dialect.name):
+        await db.execute(text(statement), {"floor": floor})
+
+
+async def _increment_counter(db: AsyncSession, count: int):
+    return await db.scalar(
+        update(MemoCounter)
+        .where(MemoCounter.name == MEMO_NUMBER_COUNTER)
+        .values(value=MemoCounter.value + count)
+        .returning(MemoCounter.value)
+    )
+
+
+async def next_memo_number(db: AsyncSession):
+    """
+    Return the memo_number value for a new memo.
+
+    On PostgreSQL this is a ``nextval()`` expression the ORM evaluates in
+    the INSERT (no extra round trip); on SQLite it is the incremented
+    counter value.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return func.nextval(MEMO_NUMBER_SEQUENCE)
+    value = await _increment_counter(db, 1)
+    if value is None:
+        await resync_memo_numbers(db)
+        value = await _increment_counter(db, 1)
+    return value
+
+
+async def allocate_memo_numbers(db: AsyncSession, count: int) -> List[int]:
+    """Reserve ``count`` new memo numbers, in increasing order."""
+    if count <= 0:
+        return []
+    if db.bind.dialect.name == "postgresql":
+        result = await db.execute(
+            text(f"SELECT nextval('{MEMO_NUMBER_SEQUENCE}') FROM generate_series(1, :count)"),
+            {"count": count}
+        )
+        return sorted(result.scalars())
+    last = await _increment_counter(db, count)
+    if last is None:
+        await resync_memo_numbers(db)
+        last = await _increment_counter(db, count)
+    return list(range(last - count + 1, last + 1))
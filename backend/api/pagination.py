@@ -0,0 +1,68 @@
+"""
+Keyset (cursor) pagination helpers for memo listings and search.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import desc, tuple_
+
+from backend.api.models import Memo
+
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str, parse):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return parse(json.loads(base64.urlsafe_b64decode(padded.encode())))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def encode_cursor(date: datetime, memo_number: int) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    return _encode({"d": date.isoformat(), "n": memo_number})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed."""
+    return _decode(cursor, lambda data: (datetime.fromisoformat(data["d"]), int(data["n"])))
+
+
+def encode_search_cursor(score: float, memo_number: int) -> str:
+    """Encode the (rank, memo_number) of the last search hit as an opaque cursor."""
+    return _encode({"s": score, "n": memo_number})
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a cursor produced by encode_search_cursor, raising 400 if it is malformed."""
+    return _decode(cursor, lambda data: (float(data["s"]), int(data["n"])))
+
+
+def listing_order(order: str):
+    """Return the ORDER BY clauses for a memo listing (date, then memo_number)."""
+    if order == "desc":
+        return [desc(Memo.date), desc(Memo.memo_number)]
+    return [Memo.date, Memo.memo_number]
+
+
+def seek_filter(order: str, cursor: Optional[str]):
+    """Return the WHERE clause that continues a listing after the given cursor."""
+    if not cursor:
+        return None
+    date, memo_number = decode_cursor(cursor)
+    # A row-value comparison is a range on the (date, memo_number) index, so
+    # the seek costs the same at any depth; the equivalent OR form is scanned
+    key = tuple_(Memo.date, Memo.memo_number)
+    if order == "desc":
+        return key < tuple_(date, memo_number)
+    return key > tuple_(date, memo_number)
@@ -0,0 +1,158 @@
+"""
+Token-bucket rate limiting for expensive endpoints (login).
+
+Each client IP gets a bucket holding at most ``burst`` attempts, refilled
+continuously at ``per_minute``; a request that finds it empty is rejected
+with 429 and a Retry-After telling the client when the next attempt will
+be accepted. The check runs as a route dependency, before the request
+reaches password verification.
+
+Every worker keeps its buckets in memory (RATE_LIMIT_MAX_KEYS, least
+recently seen dropped first), which rejects a flood without any I/O. With
+RATE_LIMIT_STORE=database, attempts the local bucket lets through are
+also taken from a bucket in the rate_limit_buckets table, so the limit
+holds across workers. A worker only ever sees a subset of a client's
+attempts, so its local bucket never rejects what the shared one would
+allow. If the shared store cannot be reached the local decision stands.
+"""
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from backend.api.database import WriteSessionLocal
+from backend.api.models import RateLimitBucket
+from backend.config import (
+    LOGIN_RATE_LIMIT_BURST,
+    LOGIN_RATE_LIMIT_ENABLED,
+    LOGIN_RATE_LIMIT_PER_MINUTE,
+    RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_PROXY_HOPS,
+    RATE_LIMIT_STORE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared takes between purges of rate_limit_buckets rows that have refilled completely
+PURGE_EVERY = 100
+
+
+def refill(tokens: float, updated_at: float, now: float, rate: float, capacity: float) -> Tuple[float, float]:
+    """Take one token from a bucket; return its new level and the seconds to wait (0 if taken)."""
+    tokens = min(capacity, tokens + max(now - updated_at, 0.0) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class TokenBuckets:
+    """In-process token buckets by key, keeping the ``max_keys`` most recently used."""
+
+    def __init__(self, per_minute: float, burst: int, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.rate = per_minute / 60
+        self.capacity = float(burst)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def take(self, key: str, now: float = None) -> float:
+        """Take a token for ``key``; return 0 if allowed, else seconds until the next one."""
+        now = time.time() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.capacity, now]
+            if len(self._buckets) > self.max_keys:
+                # Dropping a bucket hands its client a full one again, so drop the idlest
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        bucket[0], wait = refill(bucket[0], bucket[1], now, self.rate, self.capacity)
+        bucket[1] = now
+        return wait
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class DatabaseBuckets:
+    """Token buckets in the rate_limit_buckets table, shared by all workers."""
+
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60
+        self.capacity = float(burst)
+        self._takes = 0
+
+    async def take(self, key: str, now: float = None) -> float:
+        """Take a token for ``key`` in one write transaction; same result as TokenBuckets.take."""
+        now = time.time() if now is None else now
+        self._takes += 1
+        for _ in range(2):
+            try:
+                async with WriteSessionLocal() as db:
+                    # Row lock on PostgreSQL; SQLite write transactions are already exclusive
+                    bucket = (await db.execute(
+                        select(RateLimitBucket).where(RateLimitBucket.key == key).with_for_update()
+                    )).scalar_one_or_none()
+                    if bucket is None:
+                        bucket = RateLimitBucket(key=key, tokens=self.capacity, updated_at=now)
+                        db.add(bucket)
+                    bucket.tokens, wait = refill(bucket.tokens, bucket.updated_at, now, self.rate, self.capacity)
+                    bucket.updated_at = max(bucket.updated_at, now)
+                    if self._takes % PURGE_EVERY == 0:
+                        # A bucket idle long enough to be full again is the same as no row
+                        await db.execute(delete(RateLimitBucket).where(
+                            RateLimitBucket.updated_at < now - self.capacity / self.rate,
+                            RateLimitBucket.key != key
+                        ))
+                    await db.commit()
+                    return wait
+            except IntegrityError:
+                continue  # Another worker created the row first; lock it and retry
+        return 0.0
+
+
+def client_address(request: Request) -> str:
+    """Client IP, taken from X-Forwarded-For as written by the RATE_LIMIT_PROXY_HOPS trusted proxies."""
+    if RATE_LIMIT_PROXY_HOPS > 0:
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if forwarded:
+            # Entries left of the ones our proxies appended are whatever the client sent
+            return forwarded[-min(RATE_LIMIT_PROXY_HOPS, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """Route dependency rejecting a client with 429 once its bucket is empty."""
+
+    def __init__(self, name: str, per_minute: float, burst: int, enabled: bool = True, store: str = RATE_LIMIT_STORE):
+        self.name = name
+        self.enabled = enabled and per_minute > 0
+        self.local = TokenBuckets(per_minute, burst)
+        self.shared = DatabaseBuckets(per_minute, burst) if store == "database" else None
+
+    async def __call__(self, request: Request) -> None:
+        if not self.enabled:
+            return
+        key = f"{self.name}:{client_address(request)}"
+        now = time.time()
+        wait = self.local.take(key, now)
+        if not wait and self.shared is not None:
+            try:
+                wait = await self.shared.take(key, now)
+            except Exception as e:
+                logger.warning(f"Rate limit store unavailable, using per-worker limit: {e}")
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please try again later",
+                headers={"Retry-After": str(max(math.ceil(wait), 1))},
+            )
+
+
+login_rate_limit = RateLimiter(
+    "login", LOGIN_RATE_LIMIT_PER_MINUTE, LOGIN_RATE_LIMIT_BURST, enabled=LOGIN_RATE_LIMIT_ENABLED
+)
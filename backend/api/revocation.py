@@ -0,0 +1,122 @@
+"""
+Server-side revocation of access tokens.
+
+/api/logout stores the SHA-256 fingerprint of the token in the
+revoked_tokens table, with the token's own expiry so the row can be purged
+once the token would be rejected anyway, and bumps the "revoked_tokens"
+generation in cache_versions in the same transaction.
+
+verify_token must stay free of database round trips, so each worker keeps
+the revoked fingerprints in memory. The worker handling the logout adds
+the token at once; the others reload the set when they see a new
+generation, checking every TOKEN_REVOCATION_SYNC_INTERVAL seconds
+(run_revocation_poller, started on app startup).
+
+The same reload keeps the set of account names. Tokens whose subject is
+no longer an account (renamed or removed through ADMIN_USERNAME, which
+bumps the generation) are rejected like revoked ones.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, FrozenSet, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.cache import bump_generation, token_cache
+from backend.api.database import AsyncSessionLocal
+from backend.api.models import CacheVersion, RevokedToken, User
+from backend.config import TOKEN_REVOCATION_SYNC_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Row in cache_versions bumped on every revocation
+REVOCATION_VERSION = "revoked_tokens"
+
+# Fingerprint -> expiry (unix time) of every revoked, unexpired token
+_revoked: Dict[str, float] = {}
+# Usernames of existing accounts (None until first sync: nothing is rejected for it)
+_usernames: Optional[FrozenSet[str]] = None
+_generation = None
+_lock = threading.Lock()
+
+
+def token_fingerprint(token: str) -> str:
+    """Key under which a token is cached and revoked (the token itself is never stored)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def is_revoked(fingerprint: str) -> bool:
+    return fingerprint in _revoked
+
+
+def is_known_user(username: str) -> bool:
+    return _usernames is None or username in _usernames
+
+
+def _forget_expired() -> None:
+    now = time.time()
+    for fingerprint in [f for f, expires in _revoked.items() if expires < now]:
+        del _revoked[fingerprint]
+
+
+async def revoke_token(db: AsyncSession, fingerprint: str, expires: float) -> None:
+    """Revoke a token until ``expires`` (unix time) and commit."""
+    global _generation
+    expires_at = datetime.utcfromtimestamp(expires)
+    await db.merge(RevokedToken(token_hash=fingerprint, expires_at=expires_at))
+    # Rows of tokens that have expired since are no longer needed
+    await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+    generation = await bump_generation(db, REVOCATION_VERSION)
+    await db.commit()
+
+    with _lock:
+        _revoked[fingerprint] = expires
+        token_cache.delete(fingerprint)
+        # Skip the reload if no other worker revoked anything in between
+        if _generation is not None and generation == _generation + 1:
+            _generation = generation
+
+
+async def sync_revocations(db: AsyncSession) -> None:
+    """Reload the revoked fingerprints and account names if another worker has changed them."""
+    global _generation, _usernames
+    version = await db.scalar(
+        select(CacheVersion.version).where(CacheVersion.name == REVOCATION_VERSION)
+    ) or 0
+    if version == _generation:
+        with _lock:
+            _forget_expired()
+        return
+    result = await db.execute(
+        select(RevokedToken.token_hash, RevokedToken.expires_at)
+        .where(RevokedToken.expires_at >= datetime.utcnow())
+    )
+    revoked = {
+        fingerprint: (expires_at - datetime(1970, 1, 1)).total_seconds()
+        for fingerprint, expires_at in result
+    }
+    usernames = frozenset((await db.execute(select(User.username))).scalars())
+    with _lock:
+        _usernames = usernames
+        for fingerprint in revoked.keys() - _revoked.keys():
+            token_cache.delete(fingerprint)
+        # Keep local revocations committed after the read above
+        _revoked.update(revoked)
+        _forget_expired()
+        _generation = version
+
+
+async def run_revocation_poller() -> None:
+    """Pick up revocations made through other workers (started on app startup)."""
+    while True:
+        await asyncio.sleep(TOKEN_REVOCATION_SYNC_INTERVAL)
+        try:
+            async with AsyncSessionLocal() as db:
+                await sync_revocations(db)
+        except Exception as e:
+            logger.warning(f"Could not refresh revoked tokens: {e}")
@@ -3,12 +3,17 @@ Authentication routes for login/logout.
 """
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.api.auth import create_access_token, verify_password
-from backend.config import ADMIN_USERNAME, ADMIN_PASSWORD, ACCESS_TOKEN_EXPIRE_MINUTES
+from backend.api.auth import authenticate_token, create_access_token
+from backend.config import ACCESS_TOKEN_EXPIRE_MINUTES
 from backend.api.auth import verify_token
+from backend.api.database import get_write_db
+from backend.api.rate_limit import login_rate_limit
+from backend.api.revocation import revoke_token, token_fingerprint
+from backend.api.users import authenticate_user
 
 router = APIRouter(prefix="/api", tags=["auth"])
 security = HTTPBearer()
@@ -26,11 +31,11 @@ class UserResponse(BaseModel):
     username: str
     authenticated: bool
 
-@router.post("/login", response_model=LoginResponse)
+@router.post("/login", response_model=LoginResponse, dependencies=[Depends(login_rate_limit)])
 async def login(login_data: LoginRequest):
-    """Login endpoint - returns JWT token."""
-    # Simple authentication against config (can be extended to use database)
-    if login_data.username != ADMIN_USERNAME or login_data.password != ADMIN_PASSWORD:
+    """Login endpoint - returns JWT token (429 with Retry-After once a client exceeds the rate limit)."""
+    username = await authenticate_user(login_data.username, login_data.password)
+    if username is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -39,12 +44,12 @@ async def login(login_data: LoginRequest):
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": login_data.username}, expires_delta=access_token_expires
+        data={"sub": username}, expires_delta=access_token_expires
     )
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "username": login_data.username
+        "username": username
     }
 
 @router.get("/me", response_model=UserResponse)
@@ -56,7 +61,12 @@ async def get_current_user_info(username: str = Depends(verify_token)):
     }
 
 @router.post("/logout")
-async def logout():
-    """Logout endpoint (client should discard token)."""
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_write_db)
+):
+    """Logout endpoint: revokes the token on the server (the client should also discard it)."""
+    username, expires = authenticate_token(credentials.credentials)
+    await revoke_token(db, token_fingerprint(credentials.credentials), expires)
     return {"message": "Logged out successfully"}
 
@@ -1,82 +1,412 @@
 """
 Routes for memo management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy import cast, desc, func, literal, null, select, union_all
 from datetime import datetime
-from typing import List
+import zlib
+from typing import List, Optional, Tuple, Union
 
 from backend.api.models import Memo
-from backend.api.database import get_db
+from backend.api.database import AsyncSessionLocal, get_db, get_write_db
 from backend.api.auth import get_current_user
+from backend.api.aggregates import record_memo
+from backend.api.bulk import (
+    assign_memo_numbers,
+    memo_field_error,
+    memo_number_error,
+    read_bulk_items,
+    upsert_memos,
+    validate_bulk_items
+)
+from backend.api.cache import (
+    MISSING,
+    bump_generation,
+    invalidate_all,
+    invalidate_memo,
+    list_cache,
+    memo_cache,
+    nav_cache,
+    sync_caches
+)
+from backend.api.http_cache import (
+    collection_validators,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_validators
+)
+from backend.api.numbering import MEMO_NUMBER_ATTEMPTS, next_memo_number, resync_memo_numbers
+from backend.api.pagination import encode_cursor, listing_order, seek_filter
+from backend.api.schemas import (
+    BulkResult,
+    MemoLink,
+    MemoListing,
+    MemoNavigation,
+    MemoOut,
+    MemoSummary,
+    SearchHit
+)
+from backend.api.search import search_memos
 
 router = APIRouter(prefix="/api/memos", tags=["memos"])
 
-@router.get("", response_model=List[dict])
+# Longest content excerpt returned by view=summary listings
+MAX_EXCERPT_LENGTH = 500
+
+# Largest page size for search results
+MAX_SEARCH_LIMIT = 100
+
+# Rows fetched per server-side cursor round trip when exporting
+EXPORT_BATCH_SIZE = 200
+
+async def get_total_count(db: AsyncSession) -> int:
+    """Return the number of memos, cached until the next write."""
+    return (await collection_validators(db))[0]
+
+def build_listing_query(order: str, cursor: Optional[str], view: str, excerpt: int):
+    """Build the listing statement (ordered, seeking past ``cursor`` if given) without offset/limit."""
+    if view == "summary":
+        query = select(*Memo.summary_columns(excerpt))
+    else:
+        query = select(Memo)
+    query = query.order_by(*listing_order(order))
+    if cursor is not None:
+        seek = seek_filter(order, cursor)
+        if seek is not None:
+            query = query.where(seek)
+    return query
+
+async def load_memo_page(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    order: str,
+    cursor: Optional[str],
+    view: str,
+    excerpt: int
+) -> Tuple[List[Union[MemoOut, MemoSummary]], Optional[str]]:
+    """Run a listing query, returning the page as schema objects and the next cursor."""
+    serialize = MemoSummary.model_validate if view == "summary" else MemoOut.model_validate
+    query = build_listing_query(order, cursor, view, excerpt)
+
+    def fetch(result):
+        return result.all() if view == "summary" else result.scalars().all()
+
+    if cursor is None:
+        rows = fetch(await db.execute(query.offset(skip).limit(limit)))
+        return [serialize(row) for row in rows], None
+
+    rows = fetch(await db.execute(query.limit(limit)))
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.date, last.memo_number)
+    return [serialize(row) for row in rows], next_cursor
+
+def parse_memo_date(value) -> datetime:
+    """Parse an ISO date or 'Month Day, Year' string; raise ValueError otherwise."""
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Not a date: {value!r}")
+    try:
+        # Try parsing various date formats
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        # Try format: "December 30, 2025"
+        return datetime.strptime(value, "%B %d, %Y")
+
+@router.get("", response_model=MemoListing, response_model_exclude_unset=True)
 async def get_memos(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     order: str = "desc",  # "asc" for oldest first, "desc" for newest first
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,  # Opt-in keyset mode: pass "" for the first page
+    include_total: bool = False,  # Report the total memo count in X-Total-Count
+    view: str = "full",  # "summary" returns number/title/date without content
+    excerpt: int = 0,  # With view=summary, include the first N characters of content
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all memos, optionally paginated."""
-    order_by = desc(Memo.date) if order == "desc" else Memo.date
-    memos = db.query(Memo).order_by(order_by).offset(skip).limit(limit).all()
-    return [memo.to_dict() for memo in memos]
-
-@router.get("/{memo_number}", response_model=dict)
-async def get_memo_by_number(memo_number: int, db: Session = Depends(get_db)):
-    """Get a specific memo by its memo number."""
-    memo = db.query(Memo).filter(Memo.memo_number == memo_number).first()
-    if not memo:
+    """
+    Get all memos, optionally paginated.
+
+    With ``cursor`` set, ``skip`` is ignored and the page seeks directly past
+    the cursor; the cursor for the following page is returned in the
+    ``X-Next-Cursor`` header (absent on the last page).
+
+    ``view=summary`` selects only the listing columns instead of loading full
+    Memo entities, optionally with a content ``excerpt`` of up to
+    MAX_EXCERPT_LENGTH characters.
+
+    The ETag is derived from the diary's count/max(updated_at) fingerprint,
+    so a matching If-None-Match is answered with 304 before the page is
+    loaded or serialized.
+    """
+    if view not in ("full", "summary"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid view. Use 'full' or 'summary'"
+        )
+    if excerpt < 0 or excerpt > MAX_EXCERPT_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"excerpt must be between 0 and {MAX_EXCERPT_LENGTH}"
+        )
+
+    await sync_caches(db)
+    total, last_modified = await collection_validators(db)
+    etag = make_etag("list", total, last_modified, skip, limit, order, cursor, view, excerpt)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response, etag, last_modified)
+    if include_total:
+        response.headers["X-Total-Count"] = str(total)
+
+    memos, next_cursor = await list_cache.get_or_load(
+        ("page", skip, limit, order, cursor, view, excerpt),
+        lambda: load_memo_page(db, skip, limit, order, cursor, view, excerpt)
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return memos
+
+@router.get("/search", response_model=List[SearchHit])
+async def search(
+    q: str,
+    response: Response,
+    limit: int = 20,
+    cursor: Optional[str] = None,  # X-Next-Cursor from the previous page
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search over memo titles and content.
+
+    Hits are ranked (title matches weigh more than content) and carry a
+    ``snippet`` of content with matches wrapped in ``<mark>``. Further pages
+    are fetched with the ``X-Next-Cursor`` header value.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must not be empty"
+        )
+    if limit < 1 or limit > MAX_SEARCH_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {MAX_SEARCH_LIMIT}"
+        )
+
+    await sync_caches(db)
+    try:
+        hits, next_cursor = await list_cache.get_or_load(
+            ("search", q, limit, cursor),
+            lambda: search_memos(db, q, limit, cursor)
+        )
+    except DBAPIError as e:
+        import logging
+        logging.getLogger(__name__).error(f"Search failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Search is unavailable"
+        )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return hits
+
+@router.get("/export")
+async def export_memos(
+    since: Optional[datetime] = None,  # Only memos updated at or after this time
+    compress: bool = False,  # Stream a gzip file (memos.ndjson.gz) instead of plain NDJSON
+    current_user: str = Depends(get_current_user)
+):
+    """
+    Stream every memo as NDJSON, one ``GET /api/memos/{number}`` object per line.
+
+    Rows are read through a server-side cursor in batches and written as
+    they arrive, so memory stays flat however large the diary is. Lines are
+    ordered by ``updated_at``; pass the last line's ``updated_at`` as
+    ``since`` for an incremental export (deletions are not included).
+    Re-importing with ``POST /api/memos/bulk?on_conflict=update`` is
+    idempotent.
+    """
+    query = select(Memo.__table__).order_by(Memo.updated_at, Memo.id)
+    if since is not None:
+        query = query.where(Memo.updated_at >= since)
+
+    async def lines():
+        # Own session: the request-scoped one may close before streaming ends
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for batch in result.partitions():
+                yield b"".join(MemoOut.model_validate(row).model_dump_json().encode() + b"\n" for row in batch)
+
+    async def gzipped():
+        compressor = zlib.compressobj(wbits=31)  # gzip container
+        async for chunk in lines():
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    if compress:
+        return StreamingResponse(
+            gzipped(),
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="memos.ndjson.gz"'}
+        )
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="memos.ndjson"'}
+    )
+
+@router.get("/{memo_number}", response_model=MemoOut)
+async def get_memo_by_number(
+    memo_number: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a specific memo by its memo number.
+
+    The ETag and Last-Modified come from the memo's updated_at. On a cache
+    miss with conditional headers only updated_at is queried, so a 304 never
+    loads or serializes the content.
+    """
+    await sync_caches(db)
+
+    memo = memo_cache.get(memo_number)
+    epoch = memo_cache.epoch
+    if memo is MISSING and (
+        "if-none-match" in request.headers or "if-modified-since" in request.headers
+    ):
+        updated_at = await db.scalar(
+            select(Memo.updated_at).where(Memo.memo_number == memo_number)
+        )
+        if updated_at is not None:
+            etag = make_etag("memo", memo_number, updated_at)
+            if is_not_modified(request, etag, updated_at):
+                return not_modified(etag, updated_at)
+
+    if memo is MISSING:
+        found = await db.scalar(select(Memo).where(Memo.memo_number == memo_number))
+        memo = MemoOut.model_validate(found) if found else None
+        # Misses are cached as None too; creating the memo invalidates its entry
+        memo_cache.set(memo_number, memo, epoch=epoch)
+    if memo is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Memo #{memo_number} not found"
         )
-    return memo.to_dict()
 
-@router.get("/id/{memo_id}", response_model=dict)
-async def get_memo_by_id(memo_id: int, db: Session = Depends(get_db)):
+    updated_at = memo.updated_at
+    etag = make_etag("memo", memo_number, updated_at)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    set_validators(response, etag, updated_at)
+    return memo
+
+@router.get("/id/{memo_id}", response_model=MemoOut)
+async def get_memo_by_id(memo_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific memo by its database ID."""
-    memo = db.query(Memo).filter(Memo.id == memo_id).first()
+    memo = await db.get(Memo, memo_id)
     if not memo:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Memo with ID {memo_id} not found"
         )
-    return memo.to_dict()
+    return MemoOut.model_validate(memo)
+
+def build_navigation_query(memo_number: int, embed: bool = False):
+    """
+    Build a single statement returning the current memo and its neighbours.
+
+    Each branch is an index seek on memo_number (LIMIT 1) and the three are
+    combined with UNION ALL, tagged by a ``kind`` column. Neighbours only
+    carry number and title; the current memo carries its full body when
+    ``embed`` is set.
+    """
+    body_columns = [Memo.id, Memo.content, Memo.date, Memo.created_at, Memo.updated_at]
+
+    def branch(kind, condition, order_by, with_body):
+        columns = [literal(kind).label("kind"), Memo.memo_number, Memo.title]
+        if embed:
+            columns += [
+                column if with_body else cast(null(), column.type).label(column.key)
+                for column in body_columns
+            ]
+        return select(
+            select(*columns).where(condition).order_by(order_by).limit(1).subquery()
+        )
+
+    return union_all(
+        branch("current", Memo.memo_number == memo_number, Memo.memo_number, True),
+        # Previous memo (lower memo number, chronologically earlier)
+        branch("previous", Memo.memo_number < memo_number, desc(Memo.memo_number), False),
+        # Next memo (higher memo number, chronologically later)
+        branch("next", Memo.memo_number > memo_number, Memo.memo_number, False),
+    )
+
+@router.get("/nav/{memo_number}", response_model=MemoNavigation)
+async def get_memo_navigation(
+    memo_number: int,
+    request: Request,
+    response: Response,
+    embed: bool = False,  # Return the full current memo (saves a separate GET)
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get navigation information (previous and next memo) for a given memo.
+
+    Previous/next (and current, unless ``embed`` is set) only include
+    ``memo_number`` and ``title``; with ``embed=true`` the current memo is
+    returned in full, in the same shape as ``GET /api/memos/{memo_number}``.
+    """
+    await sync_caches(db)
+    # Neighbour titles can change with any write, so use the diary fingerprint
+    total, last_modified = await collection_validators(db)
+    etag = make_etag("nav", total, last_modified, memo_number, embed)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
 
-@router.get("/nav/{memo_number}", response_model=dict)
-async def get_memo_navigation(memo_number: int, db: Session = Depends(get_db)):
-    """Get navigation information (previous and next memo) for a given memo."""
-    current_memo = db.query(Memo).filter(Memo.memo_number == memo_number).first()
-    if not current_memo:
+    cached = nav_cache.get((memo_number, embed))
+    epoch = nav_cache.epoch
+    if cached is not MISSING:
+        set_validators(response, etag, last_modified)
+        return cached
+
+    result = await db.execute(build_navigation_query(memo_number, embed))
+    rows = {row.kind: row for row in result}
+    current = rows.get("current")
+    if current is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Memo #{memo_number} not found"
         )
-    
-    # Get previous memo (lower memo number, chronologically earlier)
-    prev_memo = db.query(Memo).filter(
-        Memo.memo_number < memo_number
-    ).order_by(desc(Memo.memo_number)).first()
-    
-    # Get next memo (higher memo number, chronologically later)
-    next_memo = db.query(Memo).filter(
-        Memo.memo_number > memo_number
-    ).order_by(Memo.memo_number).first()
-    
-    return {
-        "current": current_memo.to_dict(),
-        "previous": prev_memo.to_dict() if prev_memo else None,
-        "next": next_memo.to_dict() if next_memo else None
-    }
 
-@router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
+    def link(row):
+        return MemoLink.model_validate(row) if row else None
+
+    nav = MemoNavigation(
+        current=MemoOut.model_validate(current) if embed else link(current),
+        previous=link(rows.get("previous")),
+        next=link(rows.get("next"))
+    )
+    nav_cache.set((memo_number, embed), nav, epoch=epoch)
+    set_validators(response, etag, last_modified)
+    return nav
+
+@router.post("", response_model=MemoOut, status_code=status.HTTP_201_CREATED)
 async def create_memo(
     memo_data: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: str = Depends(get_current_user)
 ):
     """Create a new memo."""
@@ -88,107 +418,174 @@ async def create_memo(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Missing required field: {field}"
             )
+    field_error = memo_field_error(memo_data)
+    if field_error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=field_error)
     
     # Parse date if it's a string
-    date = memo_data['date']
-    if isinstance(date, str):
+    try:
+        date = parse_memo_date(memo_data['date'])
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid date format. Use ISO format or 'Month Day, Year'"
+        )
+    
+    # Numbers come from the database allocator (sequence/counter) unless given;
+    # a conflicting insert is retried after resyncing the allocator
+    explicit_number = memo_data.get('memo_number')
+    if explicit_number is not None:
+        number_error = memo_number_error(explicit_number)
+        if number_error:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=number_error)
+    for attempt in range(MEMO_NUMBER_ATTEMPTS):
+        memo = Memo(
+            memo_number=explicit_number if explicit_number is not None else await next_memo_number(db),
+            title=memo_data['title'],
+            content=memo_data['content'],
+            date=date
+        )
         try:
-            # Try parsing various date formats
-            date = datetime.fromisoformat(date.replace('Z', '+00:00'))
-        except:
-            try:
-                # Try format: "December 30, 2025"
-                date = datetime.strptime(date, "%B %d, %Y")
-            except:
+            db.add(memo)
+            await record_memo(db, memo.date, memo.content)
+            generation = await bump_generation(db)
+            await db.commit()
+            break
+        except IntegrityError as e:
+            await db.rollback()
+            if "memo_number" not in str(e.orig):
+                raise
+            if explicit_number is not None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid date format. Use ISO format or 'Month Day, Year'"
+                    detail=f"Memo #{explicit_number} already exists"
                 )
+            await resync_memo_numbers(db)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Could not allocate a memo number, please retry"
+        )
+
+    await db.refresh(memo)
+    invalidate_memo(memo.memo_number, generation)
     
-    # Auto-assign memo_number if not provided
-    if 'memo_number' not in memo_data:
-        last_memo = db.query(Memo).order_by(desc(Memo.memo_number)).first()
-        memo_data['memo_number'] = (last_memo.memo_number + 1) if last_memo else 1
-    
-    # Check if memo_number already exists
-    existing = db.query(Memo).filter(Memo.memo_number == memo_data['memo_number']).first()
-    if existing:
+    return MemoOut.model_validate(memo)
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_memos(
+    request: Request,
+    on_conflict: str = "skip",  # "skip" or "update" memos whose number already exists
+    db: AsyncSession = Depends(get_write_db),
+    current_user: str = Depends(get_current_user)
+):
+    """
+    Create or update many memos in one transaction.
+
+    The body is a JSON array of memos, or NDJSON (``Content-Type:
+    application/x-ndjson``) with one memo per line, each shaped like the
+    body of ``POST /api/memos``. Every item is validated before anything is
+    written; if any is invalid nothing is written and the errors are
+    returned by index. Memos without ``memo_number`` are numbered after the
+    current highest. Returns per-item results and totals.
+    """
+    if on_conflict not in ("skip", "update"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Memo #{memo_data['memo_number']} already exists"
+            detail="Invalid on_conflict. Use 'skip' or 'update'"
         )
-    
-    memo = Memo(
-        memo_number=memo_data['memo_number'],
-        title=memo_data['title'],
-        content=memo_data['content'],
-        date=date
-    )
-    
-    db.add(memo)
-    db.commit()
-    db.refresh(memo)
-    
-    return memo.to_dict()
 
-@router.put("/{memo_number}", response_model=dict)
+    items = await read_bulk_items(request)
+    rows, errors = validate_bulk_items(items, parse_memo_date)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "No memos were imported", "errors": errors}
+        )
+    if not rows:
+        return {"created": 0, "updated": 0, "skipped": 0, "results": []}
+
+    await assign_memo_numbers(db, rows)
+    statuses = await upsert_memos(db, rows, update_existing=on_conflict == "update")
+    generation = await bump_generation(db)
+    await db.commit()
+    invalidate_all(generation)
+
+    results = [
+        {"index": row["index"], "memo_number": row["memo_number"], "status": statuses[row["memo_number"]]}
+        for row in rows
+    ]
+    totals = {key: 0 for key in ("created", "updated", "skipped")}
+    for result in results:
+        totals[result["status"]] += 1
+    return {**totals, "results": results}
+
+@router.put("/{memo_number}", response_model=MemoOut)
 async def update_memo(
     memo_number: int,
     memo_data: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: str = Depends(get_current_user)
 ):
     """Update an existing memo."""
-    memo = db.query(Memo).filter(Memo.memo_number == memo_number).first()
+    memo = await db.scalar(select(Memo).where(Memo.memo_number == memo_number))
     if not memo:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Memo #{memo_number} not found"
         )
     
+    field_error = memo_field_error(memo_data)
+    if field_error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=field_error)
+    
+    old_date, old_content = memo.date, memo.content
+    
     # Update fields
     if 'title' in memo_data:
         memo.title = memo_data['title']
     if 'content' in memo_data:
         memo.content = memo_data['content']
     if 'date' in memo_data:
-        date = memo_data['date']
-        if isinstance(date, str):
-            try:
-                date = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            except:
-                try:
-                    date = datetime.strptime(date, "%B %d, %Y")
-                except:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Invalid date format"
-                    )
-        memo.date = date
+        try:
+            memo.date = parse_memo_date(memo_data['date'])
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid date format"
+            )
     
     memo.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(memo)
+    if memo.date != old_date or memo.content != old_content:
+        await record_memo(db, old_date, old_content, -1)
+        await record_memo(db, memo.date, memo.content)
+    generation = await bump_generation(db)
+    await db.commit()
+    await db.refresh(memo)
+    invalidate_memo(memo_number, generation)
     
-    return memo.to_dict()
+    return MemoOut.model_validate(memo)
 
 @router.delete("/{memo_number}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_memo(
     memo_number: int, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: str = Depends(get_current_user)
 ):
     """Delete a memo."""
-    memo = db.query(Memo).filter(Memo.memo_number == memo_number).first()
+    memo = await db.scalar(select(Memo).where(Memo.memo_number == memo_number))
     if not memo:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Memo #{memo_number} not found"
         )
     
-    db.delete(memo)
-    db.commit()
+    await db.delete(memo)
+    await record_memo(db, memo.date, memo.content, -1)
+    generation = await bump_generation(db)
+    await db.commit()
+    invalidate_memo(memo_number, generation)
     
     return None
 
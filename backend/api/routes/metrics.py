@@ -0,0 +1,28 @@
+"""
+Prometheus metrics endpoint.
+"""
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from backend.api.metrics import read_snapshots, render_metrics
+from backend.config import METRICS_TOKEN
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """Request, connection pool, cache and memory metrics summed over all workers."""
+    if METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        if not secrets.compare_digest(supplied, METRICS_TOKEN):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    return PlainTextResponse(
+        render_metrics(read_snapshots()),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,34 +1,111 @@
 """
 Routes for statistics and health checks.
 """
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, select
+from sqlalchemy.exc import IntegrityError
 
 from backend.api.models import Memo
-from backend.api.database import get_db
+from backend.api.schemas import StatsOut
+from backend.api.aggregates import load_month_stats, rebuild_month_stats
+from backend.api.database import WriteSessionLocal, get_db
+from backend.api.cache import cache_stats, stats_cache, sync_caches
+from backend.api.instrumentation import request_stats
+from backend.api.http_cache import (
+    collection_validators,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_validators
+)
 
 router = APIRouter(prefix="/api", tags=["stats"])
 
-@router.get("/stats", response_model=dict)
-async def get_stats(db: Session = Depends(get_db)):
+@router.get("/stats", response_model=StatsOut, response_model_exclude_unset=True)
+async def get_stats(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """Get statistics about the memos."""
-    total_memos = db.query(Memo).count()
+    await sync_caches(db)
+    total, last_modified = await collection_validators(db)
+    etag = make_etag("stats", total, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response, etag, last_modified)
+    return await stats_cache.get_or_load("stats", lambda: compute_stats(db))
+
+@router.get("/stats/cache", response_model=dict)
+async def get_cache_stats():
+    """Get hit/miss/eviction counters for the in-process read caches."""
+    return cache_stats()
+
+@router.get("/stats/requests", response_model=dict)
+async def get_request_stats():
+    """Get per-route latency histograms, query counts and DB time for this worker."""
+    return request_stats()
+
+async def compute_stats(db: AsyncSession) -> StatsOut:
+    """
+    Compute memo statistics.
+
+    Count, date range and the oldest/newest memo numbers come from one
+    aggregate statement over indexed columns; word/length/period figures
+    are summed from the incrementally maintained per-month table.
+    """
+    oldest_number = select(Memo.memo_number).order_by(Memo.date, Memo.memo_number).limit(1)
+    newest_number = select(Memo.memo_number).order_by(desc(Memo.date), desc(Memo.memo_number)).limit(1)
+    total_memos, oldest_date, newest_date, first_number, last_number = (await db.execute(
+        select(
+            func.count(Memo.id),
+            func.min(Memo.date),
+            func.max(Memo.date),
+            oldest_number.scalar_subquery(),
+            newest_number.scalar_subquery()
+        )
+    )).one()
+
+    months = await load_month_stats(db)
+    if sum(month.memo_count for month in months) != total_memos:
+        # First run, or memos written outside the API: recompute once, on the
+        # writer so it queues behind other writes instead of failing with
+        # SQLITE_BUSY when this read transaction tries to upgrade
+        try:
+            async with WriteSessionLocal() as write_db:
+                await rebuild_month_stats(write_db)
+        except IntegrityError:
+            pass  # Another worker rebuilt concurrently; use its result
+        # End the read transaction so the reload sees the rebuilt rows
+        await db.rollback()
+        months = await load_month_stats(db)
+
     if total_memos == 0:
-        return {
-            "total_memos": 0,
-            "oldest_date": None,
-            "newest_date": None
-        }
-    
-    oldest = db.query(Memo).order_by(Memo.date).first()
-    newest = db.query(Memo).order_by(desc(Memo.date)).first()
-    
-    return {
-        "total_memos": total_memos,
-        "oldest_date": oldest.date.isoformat() if oldest else None,
-        "newest_date": newest.date.isoformat() if newest else None,
-        "first_memo_number": oldest.memo_number if oldest else None,
-        "last_memo_number": newest.memo_number if newest else None
-    }
+        return StatsOut(
+            total_memos=0,
+            oldest_date=None,
+            newest_date=None,
+            total_words=0,
+            average_words=0,
+            average_length=0,
+            memos_per_year={},
+            memos_per_month={}
+        )
 
+    total_words = sum(month.word_count for month in months)
+    total_chars = sum(month.char_count for month in months)
+    memos_per_year = {}
+    for month in months:
+        memos_per_year[str(month.year)] = memos_per_year.get(str(month.year), 0) + month.memo_count
+
+    return StatsOut(
+        total_memos=total_memos,
+        oldest_date=oldest_date,
+        newest_date=newest_date,
+        first_memo_number=first_number,
+        last_memo_number=last_number,
+        total_words=total_words,
+        average_words=round(total_words / total_memos, 1),
+        average_length=round(total_chars / total_memos, 1),
+        memos_per_year=memos_per_year,
+        memos_per_month={
+            f"{month.year}-{month.month:02d}": month.memo_count for month in months
+        }
+    )
@@ -0,0 +1,104 @@
+"""
+Response schemas for the memo API.
+
+Models are built straight from ORM objects or result rows
+(``from_attributes``) and serialized by pydantic-core, so datetimes are
+formatted once, in native code, on the way out. Optional fields that were
+not selected (``excerpt``, or the memo numbers of an empty diary) are left
+unset and dropped from responses by ``response_model_exclude_unset``.
+"""
+from datetime import datetime
+from typing import Annotated, Dict, List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Discriminator, Tag
+
+
+class MemoOut(BaseModel):
+    """A full memo, as returned by GET /api/memos/{memo_number}."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    memo_number: int
+    title: str
+    content: str
+    date: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class MemoSummary(BaseModel):
+    """A listing entry without content (``view=summary``)."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    memo_number: int
+    title: str
+    date: datetime
+    excerpt: Optional[str] = None
+
+
+def _listing_view(page) -> str:
+    return "summary" if page and isinstance(page[0], MemoSummary) else "full"
+
+
+# Picks the item schema from the first element instead of trying each list
+# type in turn (a failed trial validates every item of the page)
+MemoListing = Annotated[
+    Union[
+        Annotated[List[MemoOut], Tag("full")],
+        Annotated[List[MemoSummary], Tag("summary")],
+    ],
+    Discriminator(_listing_view),
+]
+
+
+class MemoLink(BaseModel):
+    """A previous/next pointer in memo navigation."""
+    model_config = ConfigDict(from_attributes=True)
+
+    memo_number: int
+    title: str
+
+
+class MemoNavigation(BaseModel):
+    """The current memo (full with ``embed=true``) and its neighbours."""
+    current: Union[MemoOut, MemoLink]
+    previous: Optional[MemoLink] = None
+    next: Optional[MemoLink] = None
+
+
+class SearchHit(BaseModel):
+    """A ranked full-text search result."""
+    memo_number: int
+    title: str
+    date: Optional[datetime] = None
+    snippet: Optional[str] = None
+    rank: float
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    memo_number: int
+    status: str
+
+
+class BulkResult(BaseModel):
+    """Totals and per-item outcome of POST /api/memos/bulk."""
+    created: int
+    updated: int
+    skipped: int
+    results: List[BulkItemResult]
+
+
+class StatsOut(BaseModel):
+    """Diary statistics returned by GET /api/stats."""
+    total_memos: int
+    oldest_date: Optional[datetime] = None
+    newest_date: Optional[datetime] = None
+    first_memo_number: Optional[int] = None
+    last_memo_number: Optional[int] = None
+    total_words: int
+    average_words: float
+    average_length: float
+    memos_per_year: Dict[str, int]
+    memos_per_month: Dict[str, int]
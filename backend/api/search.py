@@ -0,0 +1,148 @@
+"""
+Full-text search over memo titles and content.
+
+PostgreSQL uses a GIN index on a weighted tsvector expression (title
+weighted above content); SQLite uses an external-content FTS5 table kept in
+sync with ``memos`` by triggers. Both rank hits so that higher scores are
+better and page through them with (score, memo_number) keyset cursors.
+"""
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import DateTime, Float, Integer, String, Text, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.pagination import decode_search_cursor, encode_search_cursor
+from backend.api.schemas import SearchHit
+
+logger = logging.getLogger(__name__)
+
+# Must match the indexed expression exactly (constants inline, not bound
+# parameters) for PostgreSQL to use the GIN index
+PG_SEARCH_VECTOR = (
+    "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B'))"
+)
+
+PG_INDEX_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_memos_search ON memos USING GIN ({PG_SEARCH_VECTOR})",
+]
+
+SQLITE_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts USING fts5("
+    "title, content, content='memos', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS memos_fts_ai AFTER INSERT ON memos BEGIN "
+    "INSERT INTO memos_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS memos_fts_ad AFTER DELETE ON memos BEGIN "
+    "INSERT INTO memos_fts(memos_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS memos_fts_au AFTER UPDATE OF title, content ON memos BEGIN "
+    "INSERT INTO memos_fts(memos_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO memos_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+]
+
+PG_SEARCH_SQL = f"""
+SELECT page.memo_number, page.title, page.date, page.score,
+       ts_headline('english', page.content, websearch_to_tsquery('english', :q),
+                   'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10') AS snippet
+FROM (
+    SELECT memo_number, title, date, content, score
+    FROM (
+        SELECT memo_number, title, date, content,
+               ts_rank({PG_SEARCH_VECTOR}, query) AS score
+        FROM memos, websearch_to_tsquery('english', :q) AS query
+        WHERE {PG_SEARCH_VECTOR} @@ query
+    ) AS hits
+    WHERE {{seek}}
+    ORDER BY score DESC, memo_number DESC
+    LIMIT :limit
+) AS page
+ORDER BY page.score DESC, page.memo_number DESC
+"""
+
+SQLITE_SCORE = "-bm25(memos_fts, 10.0, 1.0)"
+
+SQLITE_SEARCH_SQL = f"""
+SELECT m.memo_number, m.title, m.date, {SQLITE_SCORE} AS score,
+       snippet(memos_fts, 1, '<mark>', '</mark>', '…', 24) AS snippet
+FROM memos_fts JOIN memos AS m ON m.id = memos_fts.rowid
+WHERE memos_fts MATCH :q AND {{seek}}
+ORDER BY score DESC, m.memo_number DESC
+LIMIT :limit
+"""
+
+RESULT_COLUMNS = dict(
+    memo_number=Integer, title=String, date=DateTime, score=Float, snippet=Text
+)
+
+
+def init_search_index(connection: Connection) -> None:
+    """Create the full-text index for the connected database if it is missing."""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for ddl in PG_INDEX_DDL:
+            connection.execute(text(ddl))
+    elif dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memos_fts'")
+        ).first()
+        for ddl in SQLITE_INDEX_DDL:
+            connection.execute(text(ddl))
+        if not exists:
+            # Index memos written before the FTS table existed
+            connection.execute(text("INSERT INTO memos_fts(memos_fts) VALUES ('rebuild')"))
+    else:
+        logger.warning(f"Full-text search is not supported on {dialect}")
+
+
+def _fts5_query(q: str) -> Optional[str]:
+    """Quote each word so user input cannot inject FTS5 query syntax (AND semantics)."""
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{word}"' for word in words) if words else None
+
+
+async def search_memos(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    cursor: Optional[str]
+) -> Tuple[List[SearchHit], Optional[str]]:
+    """Return one page of ranked search hits and the cursor for the next page."""
+    dialect = db.bind.dialect.name
+    params = {"limit": limit}
+    if dialect == "sqlite":
+        params["q"] = _fts5_query(q)
+        if params["q"] is None:
+            return [], None
+        sql, score = SQLITE_SEARCH_SQL, SQLITE_SCORE
+        number = "m.memo_number"
+    else:
+        params["q"] = q
+        sql, score, number = PG_SEARCH_SQL, "score", "memo_number"
+
+    if cursor:
+        params["score"], params["number"] = decode_search_cursor(cursor)
+        seek = f"({score} < :score OR ({score} = :score AND {number} < :number))"
+    else:
+        seek = "1 = 1"
+
+    statement = text(sql.format(seek=seek)).columns(**RESULT_COLUMNS)
+    rows = (await db.execute(statement, params)).all()
+
+    hits = [
+        SearchHit(
+            memo_number=row.memo_number,
+            title=row.title,
+            date=row.date,
+            snippet=row.snippet,
+            rank=row.score
+        )
+        for row in rows
+    ]
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_search_cursor(rows[-1].score, rows[-1].memo_number)
+    return hits, next_cursor
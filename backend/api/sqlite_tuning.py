@@ -0,0 +1,59 @@
+"""
+SQLite tuning for single-node deployments.
+
+Every new connection gets WAL journaling (readers no longer block on the
+writer), synchronous=NORMAL (safe with WAL, fsync only at checkpoints),
+a memory map, a larger page cache and a busy timeout (so workers wait
+for the write lock instead of failing with "database is locked").
+
+The writer engine opens its transactions with BEGIN IMMEDIATE. The write
+lock is then taken up front, rather than by upgrading a read transaction
+mid-way, which SQLite cannot wait on and fails with SQLITE_BUSY instead.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.config import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_WAL
+)
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith('sqlite')
+
+
+def is_memory_database(url: str) -> bool:
+    return ':memory:' in url or url.rstrip('/').endswith(':')
+
+
+def install_pragmas(engine: Engine) -> None:
+    """Apply the tuning pragmas to every connection ``engine`` opens."""
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # busy_timeout first: switching to WAL needs a lock other workers may hold
+        cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+        if SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+        cursor.close()
+
+
+def use_immediate_transactions(engine: Engine) -> None:
+    """Make ``engine`` take the write lock when its transactions begin."""
+
+    @event.listens_for(engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        # Stop the sqlite3 module from issuing its own (deferred) BEGIN
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
@@ -0,0 +1,147 @@
+"""
+Database-backed user accounts with bcrypt password hashes.
+
+bcrypt is slow on purpose (a few hundred milliseconds per hash at cost
+12), so hashing and verification run in worker threads; bcrypt releases
+the GIL while it works. The threads come from a dedicated limiter of
+PASSWORD_HASH_THREADS, so a burst of logins queues there instead of
+blocking the event loop or taking over the threadpool that sync
+dependencies share. No pooled connection is held while a password is
+checked.
+
+A stored hash made with a different cost than BCRYPT_ROUNDS is replaced
+at the next successful login. ADMIN_USERNAME/ADMIN_PASSWORD are the only
+source of credentials: on startup they create the admin account, or
+rename it and update its password to match, and remove any other
+account, ending the sessions of the old usernames.
+"""
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+import anyio
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from backend.api.auth import get_password_hash, pwd_context, verify_password
+from backend.api.database import AsyncSessionLocal, WriteSessionLocal
+from backend.api.models import CacheVersion, User
+from backend.api.revocation import REVOCATION_VERSION
+from backend.config import ADMIN_PASSWORD, ADMIN_USERNAME, PASSWORD_HASH_THREADS
+
+logger = logging.getLogger(__name__)
+
+_limiter: Optional[anyio.CapacityLimiter] = None
+# Verified against when the username does not exist, so unknown users take as long as wrong passwords
+_dummy_hash: Optional[str] = None
+
+
+def _hash_limiter() -> anyio.CapacityLimiter:
+    # Created on first use: a limiter belongs to the running event loop
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(PASSWORD_HASH_THREADS)
+    return _limiter
+
+
+async def hash_password(password: str) -> str:
+    """bcrypt-hash a password in a worker thread."""
+    return await anyio.to_thread.run_sync(get_password_hash, password, limiter=_hash_limiter())
+
+
+async def check_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password in a worker thread; also return a new hash if the stored cost is outdated."""
+    return await anyio.to_thread.run_sync(
+        pwd_context.verify_and_update, password, hashed_password, limiter=_hash_limiter()
+    )
+
+
+async def authenticate_user(username: str, password: str) -> Optional[str]:
+    """Return the username if the credentials are valid, else None."""
+    global _dummy_hash
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(
+            select(User.id, User.username, User.hashed_password).where(User.username == username)
+        )).first()
+
+    if user is None:
+        if _dummy_hash is None:
+            _dummy_hash = await hash_password("not a real password")
+        await check_password(password, _dummy_hash)
+        return None
+
+    valid, new_hash = await check_password(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash is not None:
+        try:
+            async with WriteSessionLocal() as db:
+                await db.execute(update(User).where(User.id == user.id).values(hashed_password=new_hash))
+                await db.commit()
+            logger.info(f"Rehashed password of {user.username} with the current bcrypt cost")
+        except Exception as e:
+            logger.warning(f"Could not rehash password of {user.username}: {e}")
+    return user.username
+
+
+def _reload_usernames(connection) -> None:
+    """Bump the revocation generation so every worker reloads the account names."""
+    now = datetime.utcnow()
+    result = connection.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == REVOCATION_VERSION)
+        .values(version=CacheVersion.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(CacheVersion).values(name=REVOCATION_VERSION, version=1, updated_at=now))
+
+
+def _matches(password: str, hashed_password: str) -> bool:
+    try:
+        return verify_password(password, hashed_password)
+    except ValueError:
+        return False  # Unrecognised hash: replace it
+
+
+def ensure_admin_user(engine: Engine) -> None:
+    """
+    Make ADMIN_USERNAME/ADMIN_PASSWORD the only account.
+
+    The environment is the source of truth: if ADMIN_USERNAME changed, the
+    existing admin row is renamed, and any other account is deleted, so old
+    credentials stop working; tokens issued to the old usernames are then
+    rejected by every worker (backend.api.revocation). Hashing happens
+    outside the transaction.
+    """
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(User.id, User.username, User.hashed_password).order_by(User.id)
+        ).all()
+    admin = next((row for row in rows if row.username == ADMIN_USERNAME), rows[0] if rows else None)
+    hashed_password = None
+    if admin is None or not _matches(ADMIN_PASSWORD, admin.hashed_password):
+        hashed_password = get_password_hash(ADMIN_PASSWORD)
+    stale = [row for row in rows if admin is None or row.id != admin.id]
+
+    try:
+        with engine.begin() as connection:
+            if stale:
+                connection.execute(delete(User).where(User.id.in_([row.id for row in stale])))
+            if admin is None:
+                connection.execute(insert(User).values(username=ADMIN_USERNAME, hashed_password=hashed_password))
+            elif admin.username != ADMIN_USERNAME or hashed_password is not None:
+                values = {"username": ADMIN_USERNAME}
+                if hashed_password is not None:
+                    values["hashed_password"] = hashed_password
+                connection.execute(update(User).where(User.id == admin.id).values(**values))
+            if stale or admin is None or admin.username != ADMIN_USERNAME:
+                _reload_usernames(connection)
+    except IntegrityError:
+        return  # Another worker made the same change first
+    if stale:
+        logger.info(f"Removed accounts no longer in ADMIN_USERNAME: {', '.join(row.username for row in stale)}")
+    if admin is not None and admin.username != ADMIN_USERNAME:
+        logger.info(f"Renamed the admin account {admin.username} to {ADMIN_USERNAME}")
+    if admin is not None and hashed_password is not None:
+        logger.info(f"Updated the password of {ADMIN_USERNAME} from ADMIN_PASSWORD")
@@ -2,6 +2,7 @@
 Configuration settings for the backend.
 """
 import os
+import tempfile
 from pathlib import Path
 
 # Base directory
@@ -50,10 +51,83 @@ API_HOST = os.getenv('API_HOST', '0.0.0.0')
 API_PORT = int(os.getenv('PORT', os.getenv('API_PORT', 8001)))
 API_RELOAD = os.getenv('API_RELOAD', 'false').lower() == 'true'  # Disable reload in production by default
 
+# Database connection pools
+# Pools are sized so all gunicorn workers together stay within DB_MAX_CONNECTIONS
+# (gunicorn reads WEB_CONCURRENCY as its worker count too)
+WEB_CONCURRENCY = max(int(os.getenv('WEB_CONCURRENCY', 1)), 1)
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 20))
+_connections_per_worker = max(DB_MAX_CONNECTIONS // WEB_CONCURRENCY, 2)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', _connections_per_worker - _connections_per_worker // 4))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', _connections_per_worker // 4))
+# Seconds a request waits for a pooled connection before failing with 503
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+# Replace connections older than this many seconds (-1 = never)
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+# Test each connection with a ping on checkout (pessimistic); with false, rely on DB_POOL_RECYCLE
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+# Pool class override: "queue", "null" or "static" (default: queue, which for an
+# SQLite file means a read pool plus one writer connection; static for in-memory SQLite)
+DB_POOL_CLASS = os.getenv('DB_POOL_CLASS', '').lower()
+
+# SQLite tuning (applied on connect when DATABASE_URL is SQLite)
+SQLITE_WAL = os.getenv('SQLITE_WAL', 'true').lower() == 'true'
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+# Negative values are KiB, positive values are pages
+SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -16000))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+# Pooled read connections per worker (writes use one dedicated connection)
+SQLITE_READ_POOL_SIZE = int(os.getenv('SQLITE_READ_POOL_SIZE', 4))
+
 # CORS configuration
 CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
 CORS_ALLOW_CREDENTIALS = os.getenv('CORS_ALLOW_CREDENTIALS', 'true').lower() == 'true'
 
+# Read cache configuration (in-process cache of memo reads)
+CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'true').lower() == 'true'
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+CACHE_TTL_SECONDS = float(os.getenv('CACHE_TTL_SECONDS', 60))
+# Seconds between checks of the shared cache version (0 = check on every read)
+CACHE_SYNC_INTERVAL = float(os.getenv('CACHE_SYNC_INTERVAL', 0))
+
+# HTTP caching: max-age for public reads (0 = browsers/CDNs revalidate with ETag every time)
+HTTP_CACHE_MAX_AGE = int(os.getenv('HTTP_CACHE_MAX_AGE', 0))
+
+# Response compression (brotli when the Brotli package is installed, else gzip)
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_TYPES = os.getenv(
+    'COMPRESSION_TYPES',
+    'application/json,application/x-ndjson,text/html,text/plain,text/css,application/javascript'
+).split(',')
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+# Compressed bodies of ETagged responses kept in memory (0 = compress every time)
+COMPRESSION_CACHE_ENTRIES = int(os.getenv('COMPRESSION_CACHE_ENTRIES', 64))
+
+# Request instrumentation: Server-Timing header and slow request/query logging
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', 500))
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 100))
+
+# /health/ready: seconds allowed for the database probe, and how long a result is reused
+HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', 2))
+HEALTH_CHECK_CACHE_SECONDS = float(os.getenv('HEALTH_CHECK_CACHE_SECONDS', 5))
+
+# Prometheus /metrics: per-worker snapshots are summed from this directory, which
+# defaults to one per gunicorn master (workers share the parent pid)
+METRICS_DIR = os.getenv(
+    'METRICS_DIR',
+    os.path.join(tempfile.gettempdir(), f'digital-diary-metrics-{os.getppid()}')
+)
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+# If set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Largest number of memos accepted by one POST /api/memos/bulk request
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 10000))
+
 # Environment
 ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
 
@@ -64,8 +138,34 @@ API_VERSION = "1.0.0"
 SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production-min-32-chars')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
+# Verified tokens kept in memory so repeat requests skip signature checks (0 = verify every time)
+TOKEN_CACHE_ENTRIES = int(os.getenv('TOKEN_CACHE_ENTRIES', 1024))
+# Longest a verified token is trusted from the cache (entries also end when the token expires)
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv('TOKEN_CACHE_TTL_SECONDS', 300))
+# Seconds between checks for tokens revoked (logged out) through other workers
+TOKEN_REVOCATION_SYNC_INTERVAL = float(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', 2))
 
-# Default admin credentials (should be changed via environment variables)
+# Default admin credentials (should be changed via environment variables); they
+# create or update the admin account in the users table on startup
 ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
 ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin')  # Change this in production!
 
+# bcrypt cost factor; stored hashes made with another cost are rehashed at the next login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+# Threads per worker hashing/verifying passwords (bcrypt is CPU-bound and releases the GIL)
+PASSWORD_HASH_THREADS = int(os.getenv('PASSWORD_HASH_THREADS', min(4, os.cpu_count() or 1)))
+
+# Login throttling: a token bucket per client IP refilled at LOGIN_RATE_LIMIT_PER_MINUTE,
+# holding at most LOGIN_RATE_LIMIT_BURST attempts; excess attempts get 429 before any hashing
+LOGIN_RATE_LIMIT_ENABLED = os.getenv('LOGIN_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+LOGIN_RATE_LIMIT_PER_MINUTE = float(os.getenv('LOGIN_RATE_LIMIT_PER_MINUTE', 10))
+LOGIN_RATE_LIMIT_BURST = int(os.getenv('LOGIN_RATE_LIMIT_BURST', 5))
+# Where buckets live: 'memory' (per worker) or 'database' (shared by all workers);
+# defaults to 'database' when several workers run
+RATE_LIMIT_STORE = os.getenv('RATE_LIMIT_STORE', 'database' if WEB_CONCURRENCY > 1 else 'memory').lower()
+# Most client keys tracked in memory per worker (least recently seen are dropped)
+RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 10000))
+# Reverse proxies in front of the app that append to X-Forwarded-For (Render has one);
+# 0 uses the socket address
+RATE_LIMIT_PROXY_HOPS = int(os.getenv('RATE_LIMIT_PROXY_HOPS', 1 if os.getenv('RENDER') else 0))
+
@@ -1,23 +1,38 @@
 """
 Main FastAPI application entry point.
 """
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from backend.config import (
     API_VERSION,
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_ENABLED,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_TYPES,
     CORS_ORIGINS,
     CORS_ALLOW_CREDENTIALS,
     ENVIRONMENT
 )
-from backend.api.database import init_db
-from backend.api.routes import memos, stats, auth
+from backend.api.compression import CompressionMiddleware
+from backend.api.instrumentation import TimingMiddleware
+from backend.api.health import check_readiness
+from backend.api.metrics import run_flusher
+from backend.api.revocation import run_revocation_poller, sync_revocations
+from backend.api.database import AsyncSessionLocal, async_engine, init_db, write_engine
+from backend.api.routes import memos, stats, auth, metrics
 
 # Create FastAPI app
 app = FastAPI(
     title="Digital Diary API",
     description="Backend API for managing diary memos",
-    version=API_VERSION
+    version=API_VERSION,
+    # orjson encodes responses several times faster than the stdlib json module
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -27,12 +42,27 @@ app.add_middleware(
     allow_credentials=CORS_ALLOW_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],  # Let the browser read pagination headers
 )
 
+# Response compression (brotli/gzip)
+if COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MIN_SIZE,
+        content_types=COMPRESSION_TYPES,
+        gzip_level=COMPRESSION_GZIP_LEVEL,
+        brotli_quality=COMPRESSION_BROTLI_QUALITY
+    )
+
+# Per-request latency, query count and DB time (outermost, so it times everything)
+app.add_middleware(TimingMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(memos.router)
 app.include_router(stats.router)
+app.include_router(metrics.router)
 
 # Root endpoint
 @app.get("/")
@@ -50,6 +80,15 @@ async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+# Readiness check (database round trip and pool saturation)
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness check: 503 if the database cannot be reached through the pool in time."""
+    result = await check_readiness()
+    if result["status"] != "ready":
+        return ORJSONResponse(result, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return result
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
@@ -63,6 +102,29 @@ async def startup_event():
         # Don't fail startup if database init fails (might be first run)
         # The database will be created on first use
 
+    # Load revoked tokens before serving, then follow revocations by other workers
+    try:
+        async with AsyncSessionLocal() as db:
+            await sync_revocations(db)
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Failed to load revoked tokens: {e}")
+    app.state.revocation_poller = asyncio.create_task(run_revocation_poller())
+
+    # Publish this worker's counters for /metrics in other workers
+    app.state.metrics_flusher = asyncio.create_task(run_flusher())
+
+# Release pooled async connections on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks and dispose of the async database engines."""
+    app.state.metrics_flusher.cancel()
+    app.state.revocation_poller.cancel()
+    await async_engine.dispose()
+    if write_engine is not async_engine:
+        await write_engine.dispose()
+
 if __name__ == "__main__":
     import uvicorn
     from backend.config import API_HOST, API_PORT, API_RELOAD
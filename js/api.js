@@ -17,6 +17,22 @@ const API = {
         return await response.json();
     },
     
+    /**
+     * Get one page of memo summaries (no content) plus the total memo count
+     * (from X-Total-Count)
+     */
+    async getMemosPage(order = 'desc', limit = 10, skip = 0) {
+        const response = await fetch(
+            `${this.baseUrl}/api/memos?order=${order}&limit=${limit}&skip=${skip}&include_total=true&view=summary`
+        );
+        if (!response.ok) {
+            throw new Error(`Failed to fetch memos: ${response.status} ${response.statusText}`);
+        }
+        const memos = await response.json();
+        const total = parseInt(response.headers.get('X-Total-Count'), 10);
+        return { memos, total: Number.isNaN(total) ? memos.length : total };
+    },
+    
     /**
      * Get a memo by number
      */
@@ -29,10 +45,11 @@ const API = {
     },
     
     /**
-     * Get memo navigation (prev/next)
+     * Get memo navigation (prev/next); with embed, nav.current is the full memo
      */
-    async getMemoNavigation(memoNumber) {
-        const response = await fetch(`${this.baseUrl}/api/memos/nav/${memoNumber}`);
+    async getMemoNavigation(memoNumber, embed = false) {
+        const query = embed ? '?embed=true' : '';
+        const response = await fetch(`${this.baseUrl}/api/memos/nav/${memoNumber}${query}`);
         if (!response.ok) {
             throw new Error(`Failed to fetch navigation: ${response.status} ${response.statusText}`);
         }
@@ -47,13 +47,10 @@ async function loadMemos() {
         const skip = (currentPage - 1) * MEMOS_PER_PAGE;
         console.log(`Loading memos from ${API.baseUrl}/api/memos (page ${currentPage}, skip ${skip})`);
         
-        // First get total count for pagination
-        if (totalMemos === 0) {
-            const allMemos = await API.getMemos('desc', 1000, 0);
-            totalMemos = allMemos.length;
-        }
-        
-        const memos = await API.getMemos('desc', MEMOS_PER_PAGE, skip);
+        // Page and total count (for pagination) come back in one request
+        const page = await API.getMemosPage('desc', MEMOS_PER_PAGE, skip);
+        const memos = page.memos;
+        totalMemos = page.total;
         console.log(`Loaded ${memos.length} memos (page ${currentPage} of ${Math.ceil(totalMemos / MEMOS_PER_PAGE)})`);
         
         const entriesContainer = document.getElementById('diary-entries');
@@ -23,16 +23,11 @@ async function loadMemo() {
         
         console.log(`Loading memo #${memoNumber}`);
         
-        // Load memo and navigation
+        // Load memo and navigation in one request (current memo is embedded)
         let memo, nav;
         try {
-            [memo, nav] = await Promise.all([
-                API.getMemo(memoNumber),
-                API.getMemoNavigation(memoNumber).catch(err => {
-                    console.warn('Navigation failed:', err);
-                    return { previous: null, next: null, current: null };
-                })
-            ]);
+            nav = await API.getMemoNavigation(memoNumber, true);
+            memo = nav.current;
         } catch (fetchError) {
             console.error('Network error:', fetchError);
             throw new Error(`Failed to connect to API. Make sure the server is running at ${API.baseUrl}`);
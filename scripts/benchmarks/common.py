@@ -0,0 +1,77 @@
+"""
+Helpers shared by the benchmark scripts: project imports, run metadata
+and saved baselines.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Make the backend package importable when a script is run directly
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def git_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata():
+    """Where and when a benchmark ran, stored alongside its results."""
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count()
+    }
+
+
+def baseline_path(name, directory=BASELINE_DIR):
+    """A baseline name (stored in ``directory``), or a path to a baseline file."""
+    path = Path(name)
+    if path.suffix == ".json" or path.parent != Path("."):
+        return path
+    return directory / f"{name}.json"
+
+
+def save_baseline(name, data, directory=BASELINE_DIR):
+    path = baseline_path(name, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return path
+
+
+def load_baseline(name, directory=BASELINE_DIR):
+    path = baseline_path(name, directory)
+    if not path.exists():
+        print(f"❌ Baseline not found: {path}")
+        print("   Save one on this machine first with --save-baseline (see scripts/README.md)")
+        sys.exit(2)
+    with open(path) as f:
+        return json.load(f)
+
+
+def percentile(sorted_values, fraction):
+    """Linear-interpolated percentile of an already sorted list (fraction in 0..1)."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
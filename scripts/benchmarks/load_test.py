@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Load and latency benchmark for the Digital Diary API.
+
+Seeds a database with synthetic memos (see seed.py), then drives
+backend.main:app either in-process through httpx's ASGI transport (no
+network, measures the application alone) or over a local socket against
+uvicorn worker processes, at a configurable concurrency. Each endpoint
+is measured separately and reported as p50/p95/p99 latency and
+throughput. Results can be saved as a named baseline and later runs
+compared against it; a run slower than the baseline by more than the
+tolerance exits with status 1.
+
+Usage:
+    python3 scripts/benchmarks/load_test.py --memos 10000 --concurrency 20
+    python3 scripts/benchmarks/load_test.py --memos 10000 --save-baseline main
+    python3 scripts/benchmarks/load_test.py --memos 10000 --compare main
+    python3 scripts/benchmarks/load_test.py --transport socket --workers 4
+    python3 scripts/benchmarks/load_test.py --endpoints login --requests 100 --concurrency 20
+
+Without --database-url, each memo count is seeded once into a template
+SQLite file in the temp directory and every run starts from a fresh copy
+of it, so runs are reproducible and writes do not accumulate.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import PROJECT_ROOT, load_baseline, percentile, run_metadata, save_baseline
+
+ENDPOINTS = ("list", "single", "nav", "stats", "create", "login")
+# login is opt-in: each attempt costs a full bcrypt verification
+DEFAULT_ENDPOINTS = ("list", "single", "nav", "stats", "create")
+TEMPLATE_DIR = Path(tempfile.gettempdir()) / "digital-diary-bench"
+PAGE_SIZE = 10  # Matches MEMOS_PER_PAGE in js/diary.js
+
+
+def build_requests(endpoint, count, numbers, rng):
+    """(method, url, json body, expected status) for each request, fixed by the seed."""
+    from backend.config import ADMIN_PASSWORD, ADMIN_USERNAME
+    from seed import make_content, make_title
+
+    pages = max(1, min(10, len(numbers) // PAGE_SIZE))
+    requests = []
+    for _ in range(count):
+        if endpoint == "list":
+            skip = rng.randrange(pages) * PAGE_SIZE
+            url = f"/api/memos?order=desc&limit={PAGE_SIZE}&skip={skip}&include_total=true&view=summary"
+            requests.append(("GET", url, None, 200))
+        elif endpoint == "single":
+            requests.append(("GET", f"/api/memos/{rng.choice(numbers)}", None, 200))
+        elif endpoint == "nav":
+            requests.append(("GET", f"/api/memos/nav/{rng.choice(numbers)}?embed=true", None, 200))
+        elif endpoint == "stats":
+            requests.append(("GET", "/api/stats", None, 200))
+        elif endpoint == "create":
+            body = {"title": make_title(rng), "content": make_content(rng), "date": "2026-01-01T09:00:00"}
+            requests.append(("POST", "/api/memos", body, 201))
+        elif endpoint == "login":
+            body = {"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}
+            requests.append(("POST", "/api/login", body, 200))
+    return requests
+
+
+async def run_endpoint(client, requests, concurrency, headers):
+    """Send ``requests`` from ``concurrency`` workers; return latencies (ms), errors and wall time."""
+    latencies, errors = [], 0
+    position = 0
+
+    async def worker():
+        nonlocal position, errors
+        while position < len(requests):
+            method, url, body, expected = requests[position]
+            position += 1
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body, headers=headers)
+                ok = response.status_code == expected
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(latencies[-1], 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1)
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, workers, log_path):
+    """Run uvicorn on ``port`` and wait until it answers /health."""
+    import httpx
+
+    # Server output (slow request warnings) goes to a log rather than into the report
+    log = open(log_path, "w")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=PROJECT_ROOT, env=os.environ.copy(), stdout=log, stderr=subprocess.STDOUT
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            print(Path(log_path).read_text()[-2000:])
+            sys.exit(f"❌ Server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    print(Path(log_path).read_text()[-2000:])
+    sys.exit("❌ Server did not become healthy within 30s")
+
+
+def copy_sqlite(source, target):
+    """Consistent copy of a SQLite database (including pages still in its WAL)."""
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+def prepare_database(args, run_dir):
+    """Point DATABASE_URL at the benchmark database and seed it if needed."""
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+        import seed
+        from backend.api.database import init_db
+        init_db()
+        existing = seed.count_memos()
+        if existing and args.reseed:
+            seed.clear_memos()
+            existing = 0
+        if not existing:
+            seed.seed_database(args.memos, args.seed)
+        elif existing != args.memos:
+            print(f"⚠️  Using the {existing} memos already in the database (pass --reseed to replace them)")
+        return
+
+    database = run_dir / "bench.db"
+    template = TEMPLATE_DIR / f"memos-{args.memos}-seed{args.seed}.db"
+    if template.exists() and not args.reseed:
+        copy_sqlite(template, database)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    import seed
+    from backend.api.database import init_db
+    init_db()
+    if not seed.count_memos():
+        seed.seed_database(args.memos, args.seed)
+        TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
+        copy_sqlite(database, template)
+
+
+def memo_numbers():
+    from sqlalchemy import select
+    from backend.api.database import engine
+    from backend.api.models import Memo
+    with engine.connect() as connection:
+        return list(connection.execute(select(Memo.memo_number)).scalars())
+
+
+async def benchmark(args, base_url, transport):
+    import httpx
+    from backend.api.auth import create_access_token
+    from backend.config import ADMIN_USERNAME
+
+    numbers = memo_numbers()
+    if not numbers:
+        sys.exit("❌ The benchmark database has no memos")
+    rng = random.Random(args.seed)
+    auth = {"Authorization": f"Bearer {create_access_token({'sub': ADMIN_USERNAME})}"}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=60) as client:
+        for endpoint in args.endpoints:
+            headers = auth if endpoint == "create" else None
+            warmup = build_requests(endpoint, args.warmup, numbers, rng)
+            measured = build_requests(endpoint, args.requests, numbers, rng)
+            await run_endpoint(client, warmup, args.concurrency, headers)
+            results[endpoint] = summarize(*await run_endpoint(client, measured, args.concurrency, headers))
+            print_row(endpoint, results[endpoint])
+    return results
+
+
+def print_header():
+    print(f"\n{'endpoint':<10}{'requests':>9}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'max ms':>10}{'req/s':>10}")
+    print("-" * 77)
+
+
+def print_row(endpoint, r):
+    print(f"{endpoint:<10}{r['requests']:>9}{r['errors']:>8}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+          f"{r['p99_ms']:>10.2f}{r['max_ms']:>10.2f}{r['throughput_rps']:>10.1f}")
+
+
+def compare(baseline, settings, results, tolerance):
+    """Print the change against ``baseline``; return the regressions beyond ``tolerance``."""
+    differing = {k: (baseline["settings"].get(k), v) for k, v in settings.items()
+                 if k != "database" and baseline["settings"].get(k) != v}
+    if differing:
+        print(f"\n⚠️  Settings differ from the baseline: {differing}")
+
+    print(f"\nCompared with baseline from {baseline['created']} (commit {baseline['commit']}):")
+    regressions = []
+    for endpoint, current in results.items():
+        before = baseline["results"].get(endpoint)
+        if before is None:
+            continue
+        changes = []
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            change = (current[metric] - before[metric]) / before[metric] if before[metric] else 0.0
+            # Latency should not grow, throughput should not shrink
+            worse = change > tolerance if metric.endswith("_ms") else -change > tolerance
+            changes.append(f"{metric.replace('_ms', '').replace('throughput_', '')} {change:+.1%}{' ❌' if worse else ''}")
+            if worse:
+                regressions.append(f"{endpoint} {metric}: {before[metric]} -> {current[metric]}")
+        print(f"   {endpoint:<8} " + ", ".join(changes))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark API latency and throughput")
+    parser.add_argument("--memos", type=int, default=1000, help="Memos to seed: 1000, 10000, 100000 (default: 1000)")
+    parser.add_argument("--database-url", help="Benchmark this database instead of a temporary SQLite copy")
+    parser.add_argument("--reseed", action="store_true", help="Replace existing memos / rebuild the template")
+    parser.add_argument("--seed", type=int, default=1729, help="Random seed for data and requests")
+    parser.add_argument("--transport", choices=("asgi", "socket"), default="asgi",
+                        help="In-process ASGI calls or HTTP over a local socket (default: asgi)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --transport socket")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients (default: 10)")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per endpoint (default: 500)")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per endpoint first (default: 50)")
+    parser.add_argument("--endpoints", default=",".join(DEFAULT_ENDPOINTS),
+                        help=f"Comma-separated subset of {', '.join(ENDPOINTS)} (default: all but login)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the in-process read caches")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Save results as scripts/benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with a saved baseline (name or path)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline as a fraction (default: 0.25)")
+    args = parser.parse_args()
+    args.endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main():
+    args = parse_args()
+    # Slow query/request warnings from seeding and in-process requests would interleave with the report
+    logging.getLogger("backend").setLevel(logging.ERROR)
+    if args.no_cache:
+        os.environ["CACHE_ENABLED"] = "false"
+    # The login endpoint measures password verification, not the 429s the limiter would return
+    os.environ.setdefault("LOGIN_RATE_LIMIT_ENABLED", "false")
+
+    run_dir = Path(tempfile.mkdtemp(prefix="digital-diary-bench-"))
+    # Workers of this run share a metrics directory that is removed afterwards
+    os.environ.setdefault("METRICS_DIR", str(run_dir / "metrics"))
+    server = None
+    try:
+        prepare_database(args, run_dir)
+        settings = {
+            "memos": args.memos,
+            "database": os.environ["DATABASE_URL"].split("://")[0],
+            "transport": args.transport,
+            "workers": args.workers if args.transport == "socket" else None,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "cache": not args.no_cache,
+            "seed": args.seed
+        }
+        print(f"🚀 Benchmarking {settings['memos']} memos over {args.transport} "
+              f"at concurrency {args.concurrency}")
+
+        if args.transport == "socket":
+            port = free_port()
+            server = start_server(port, args.workers, run_dir / "server.log")
+            base_url, transport = f"http://127.0.0.1:{port}", None
+        else:
+            import httpx
+            from backend.main import app
+            base_url, transport = "http://bench", httpx.ASGITransport(app=app)
+
+        print_header()
+        results = asyncio.run(benchmark(args, base_url, transport))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    report = {**run_metadata(), "settings": settings, "results": results}
+    if args.save_baseline:
+        path = save_baseline(args.save_baseline, report)
+        print(f"\n💾 Baseline saved to {path}")
+    if args.compare:
+        regressions = compare(load_baseline(args.compare), settings, results, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the memo pipeline's hot paths.
+
+Times, in isolation and without a database: ORM-to-JSON conversion
+(Memo.to_dict and the MemoOut schema), response encoding as FastAPI does
+it (the old List[dict] + JSONResponse path and the current response
+model + ORJSONResponse path), date parsing in create/update, JWT
+verification (cached and uncached), and building/compiling the list and nav statements.
+
+Each benchmark is calibrated to a fixed sample duration and sampled
+repeatedly. Results can be saved as a baseline; comparing against one
+reports the change in median per benchmark with a Mann-Whitney U test,
+and exits with status 1 when a benchmark is significantly slower by more
+than the threshold.
+
+Usage:
+    python3 scripts/benchmarks/micro.py
+    python3 scripts/benchmarks/micro.py --save-baseline before
+    python3 scripts/benchmarks/micro.py --compare before
+    python3 scripts/benchmarks/micro.py --filter query --samples 30
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import timeit
+from datetime import datetime
+
+from common import BASELINE_DIR, load_baseline, run_metadata, save_baseline
+
+MICRO_BASELINE_DIR = BASELINE_DIR / "micro"
+PAGE_SIZE = 100  # Default limit of GET /api/memos
+SUMMARY_PAGE_SIZE = 10  # Diary page (view=summary)
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register a setup function returning the zero-argument callable to time."""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+def sample_memos(count):
+    from backend.api.models import Memo
+    from seed import generate_memos
+    return [
+        Memo(id=number, memo_number=number, title=title, content=content,
+             date=date, created_at=date, updated_at=date)
+        for number, title, content, date in generate_memos(count)
+    ]
+
+
+def run_coroutine(coroutine):
+    """Run a coroutine that never suspends (serialize_response) without an event loop."""
+    try:
+        coroutine.send(None)
+    except StopIteration as finished:
+        return finished.value
+    raise RuntimeError("coroutine suspended")
+
+
+def route(path, method="GET"):
+    from backend.main import app
+    for candidate in app.routes:
+        if getattr(candidate, "path", None) == path and method in candidate.methods:
+            return candidate
+    raise LookupError(f"{method} {path}")
+
+
+@benchmark(f"Memo.to_dict x{PAGE_SIZE}")
+def bench_to_dict():
+    memos = sample_memos(PAGE_SIZE)
+    return lambda: [memo.to_dict() for memo in memos]
+
+
+@benchmark(f"MemoOut.model_validate x{PAGE_SIZE}")
+def bench_model_validate():
+    from backend.api.schemas import MemoOut
+    memos = sample_memos(PAGE_SIZE)
+    return lambda: [MemoOut.model_validate(memo) for memo in memos]
+
+
+@benchmark(f"encode List[dict] + JSONResponse x{PAGE_SIZE}")
+def bench_encode_dicts():
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    memos = sample_memos(PAGE_SIZE)
+    # What a route returning to_dict() results without a response_model costs
+    return lambda: JSONResponse(jsonable_encoder([memo.to_dict() for memo in memos])).body
+
+
+@benchmark(f"encode response_model + ORJSONResponse x{PAGE_SIZE}")
+def bench_encode_models():
+    from fastapi.responses import ORJSONResponse
+    from fastapi.routing import serialize_response
+    from backend.api.schemas import MemoOut
+    listing = route("/api/memos")
+    memos = [MemoOut.model_validate(memo) for memo in sample_memos(PAGE_SIZE)]
+
+    def encode():
+        content = run_coroutine(serialize_response(
+            field=listing.response_field, response_content=memos,
+            exclude_unset=listing.response_model_exclude_unset
+        ))
+        return ORJSONResponse(content).body
+    return encode
+
+
+@benchmark(f"encode summary page x{SUMMARY_PAGE_SIZE}")
+def bench_encode_summaries():
+    from fastapi.responses import ORJSONResponse
+    from fastapi.routing import serialize_response
+    from backend.api.schemas import MemoSummary
+    listing = route("/api/memos")
+    summaries = [MemoSummary.model_validate(memo) for memo in sample_memos(SUMMARY_PAGE_SIZE)]
+
+    def encode():
+        content = run_coroutine(serialize_response(
+            field=listing.response_field, response_content=summaries,
+            exclude_unset=listing.response_model_exclude_unset
+        ))
+        return ORJSONResponse(content).body
+    return encode
+
+
+@benchmark("parse_memo_date ISO")
+def bench_parse_iso():
+    from backend.api.routes.memos import parse_memo_date
+    return lambda: parse_memo_date("2025-12-30T00:00:00")
+
+
+@benchmark("parse_memo_date 'Month D, YYYY'")
+def bench_parse_long():
+    from backend.api.routes.memos import parse_memo_date
+    return lambda: parse_memo_date("December 30, 2025")
+
+
+@benchmark("verify_token")
+def bench_verify_token():
+    from fastapi.security import HTTPAuthorizationCredentials
+    from backend.api.auth import create_access_token, verify_token
+    from backend.config import ADMIN_USERNAME
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=create_access_token({"sub": ADMIN_USERNAME})
+    )
+    return lambda: verify_token(credentials)
+
+
+@benchmark("decode_token (uncached)")
+def bench_decode_token():
+    from backend.api.auth import create_access_token, decode_token
+    from backend.config import ADMIN_USERNAME
+    token = create_access_token({"sub": ADMIN_USERNAME})
+    return lambda: decode_token(token)
+
+
+@benchmark("login rate limit check, rejected (in-memory)")
+def bench_rate_limit_rejected():
+    from backend.api.rate_limit import TokenBuckets
+    buckets = TokenBuckets(per_minute=10, burst=5)
+    for _ in range(5):
+        buckets.take("login:203.0.113.7")
+    return lambda: buckets.take("login:203.0.113.7")
+
+
+def compile_benchmark(build, dialect_name):
+    from sqlalchemy.dialects import postgresql, sqlite
+    dialect = {"sqlite": sqlite.dialect(), "postgresql": postgresql.dialect()}[dialect_name]
+    return lambda: build().compile(dialect=dialect)
+
+
+@benchmark("list query build+compile (sqlite)")
+def bench_list_query_sqlite():
+    from backend.api.routes.memos import build_listing_query
+    return compile_benchmark(lambda: build_listing_query("desc", None, "full", 0).offset(0).limit(10), "sqlite")
+
+
+@benchmark("list query build+compile (postgresql)")
+def bench_list_query_postgresql():
+    from backend.api.routes.memos import build_listing_query
+    return compile_benchmark(lambda: build_listing_query("desc", None, "full", 0).offset(0).limit(10), "postgresql")
+
+
+@benchmark("summary query build+compile, cursor (sqlite)")
+def bench_summary_query_cursor():
+    from backend.api.pagination import encode_cursor
+    from backend.api.routes.memos import build_listing_query
+    cursor = encode_cursor(datetime(2025, 6, 1), 500)
+    return compile_benchmark(lambda: build_listing_query("desc", cursor, "summary", 200).limit(10), "sqlite")
+
+
+@benchmark("nav query build+compile, embed (sqlite)")
+def bench_nav_query_sqlite():
+    from backend.api.routes.memos import build_navigation_query
+    return compile_benchmark(lambda: build_navigation_query(500, embed=True), "sqlite")
+
+
+@benchmark("nav query build+compile, embed (postgresql)")
+def bench_nav_query_postgresql():
+    from backend.api.routes.memos import build_navigation_query
+    return compile_benchmark(lambda: build_navigation_query(500, embed=True), "postgresql")
+
+
+@benchmark("nav query build+cache key")
+def bench_nav_cache_key():
+    from backend.api.routes.memos import build_navigation_query
+    # At run time the compiled form is reused; building the statement and its
+    # cache key is what every request still pays
+    return lambda: build_navigation_query(500, embed=True)._generate_cache_key()
+
+
+def measure(fn, samples, sample_time):
+    """Per-call times in microseconds, one per sample of ~``sample_time`` seconds."""
+    timer = timeit.Timer(fn)
+    loops, elapsed = timer.autorange()
+    loops = max(1, math.ceil(loops * sample_time / elapsed))
+    return [t / loops * 1e6 for t in timer.repeat(repeat=samples, number=loops)], loops
+
+
+def summarize(times):
+    quartiles = statistics.quantiles(times, n=4)
+    return {
+        "median_us": round(statistics.median(times), 4),
+        "mean_us": round(statistics.fmean(times), 4),
+        "stdev_us": round(statistics.stdev(times), 4) if len(times) > 1 else 0.0,
+        "iqr_us": round(quartiles[2] - quartiles[0], 4),
+        "min_us": round(min(times), 4),
+        "samples": [round(t, 4) for t in times]
+    }
+
+
+def mann_whitney_p(a, b):
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation, tie corrected)."""
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    n1, n2, n = len(a), len(b), len(a) + len(b)
+    rank_sum, ties, i = 0.0, 0.0, 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2) / sigma
+    return 2 * (1 - statistics.NormalDist().cdf(abs(z)))
+
+
+def format_us(value):
+    return f"{value:.2f}" if value < 1000 else f"{value:,.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark serialization, parsing, auth and query building")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--samples", type=int, default=20, help="Samples per benchmark (default: 20)")
+    parser.add_argument("--sample-time", type=float, default=0.05, help="Seconds per sample (default: 0.05)")
+    parser.add_argument("--save-baseline", metavar="NAME",
+                        help="Save results as scripts/benchmarks/baselines/micro/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with a saved baseline (name or path)")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level (default: 0.01)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Smallest change in median reported as slower/faster (default: 0.1)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Nothing here touches the database, but importing the backend configures one
+    os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    # Load the whole app up front so every benchmark runs with the same modules imported
+    import backend.main  # noqa: F401
+    selected = [(name, setup) for name, setup in BENCHMARKS if args.filter.lower() in name.lower()]
+    if not selected:
+        sys.exit(f"❌ No benchmark matches {args.filter!r}")
+    baseline = load_baseline(args.compare, MICRO_BASELINE_DIR)["results"] if args.compare else {}
+
+    width = max(len(name) for name, _ in selected)
+    if not args.json:
+        header = f"{'benchmark':<{width}}  {'median µs':>10}  {'IQR µs':>9}  {'min µs':>9}"
+        if baseline:
+            header += f"  {'before µs':>10}  {'change':>8}  {'p':>7}"
+        print(header)
+        print("-" * len(header))
+
+    results, slower = {}, []
+    for name, setup in selected:
+        times, loops = measure(setup(), args.samples, args.sample_time)
+        results[name] = {**summarize(times), "loops": loops}
+        row = (f"{name:<{width}}  {format_us(results[name]['median_us']):>10}  "
+               f"{format_us(results[name]['iqr_us']):>9}  {format_us(results[name]['min_us']):>9}")
+        before = baseline.get(name)
+        if before:
+            change = results[name]["median_us"] / before["median_us"] - 1
+            p = mann_whitney_p(times, before["samples"])
+            verdict = ""
+            if p < args.alpha and abs(change) >= args.threshold:
+                verdict = "  ❌ slower" if change > 0 else "  ✅ faster"
+                if change > 0:
+                    slower.append(name)
+            row += f"  {format_us(before['median_us']):>10}  {change:>+8.1%}  {p:>7.3f}{verdict}"
+        if not args.json:
+            print(row, flush=True)
+
+    report = {**run_metadata(), "settings": {"samples": args.samples, "sample_time": args.sample_time},
+              "results": results}
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if args.save_baseline:
+        path = save_baseline(args.save_baseline, report, MICRO_BASELINE_DIR)
+        print(f"\n💾 Baseline saved to {path}", file=sys.stderr if args.json else sys.stdout)
+    if baseline and slower:
+        print(f"\n❌ Significantly slower (p < {args.alpha}, ≥{args.threshold:.0%}): {', '.join(slower)}",
+              file=sys.stderr if args.json else sys.stdout)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Seed a database with synthetic memos for benchmarking.
+
+Memos are generated from a fixed random seed, so the same count always
+produces the same diary: titles of a few words, bodies of a few hundred
+words (log-normally distributed, like real entries) split into
+paragraphs, and dates spread over up to twenty years. Works with SQLite
+and PostgreSQL; the target is DATABASE_URL (or --database-url).
+
+Usage:
+    python3 scripts/benchmarks/seed.py --memos 10000 --database-url sqlite:////tmp/bench.db
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from common import PROJECT_ROOT  # noqa: F401 (puts the backend on sys.path)
+
+SIZES = (1000, 10000, 100000)
+DEFAULT_SEED = 1729
+BATCH_SIZE = 1000
+LAST_DATE = datetime(2025, 12, 31, 21, 0)
+
+WORDS = """
+the a and to of in that it was i my me we you for on with as at this be but not
+by from had have so all what when there one they if out up about just more time
+day night morning evening light rain sun wind sea river road city home room door
+window letter book page ink silence memory dream thought moment year week hour
+friend mother father sister brother stranger child heart mind hand eyes voice
+walk wait remember forget write read listen feel know think believe hope fear
+love leave return begin end change stay quiet small long old new first last
+still again always never perhaps almost only even because while though until
+city train station coffee tea garden tree leaves winter spring summer autumn
+infinity conquest journey question answer truth doubt faith reason wonder
+""".split()
+
+
+def make_title(rng):
+    words = rng.choices(WORDS, k=rng.randint(2, 7))
+    return " ".join(words).capitalize()
+
+
+def make_content(rng):
+    # Median around 300 words with a long tail, like real diary entries
+    word_count = max(40, min(3000, int(rng.lognormvariate(5.7, 0.6))))
+    paragraphs, written = [], 0
+    while written < word_count:
+        sentences = []
+        for _ in range(rng.randint(2, 6)):
+            length = min(rng.randint(8, 25), word_count - written)
+            if length <= 0:
+                break
+            sentence = " ".join(rng.choices(WORDS, k=length))
+            sentences.append(sentence.capitalize() + rng.choice(".....?!"))
+            written += length
+        paragraphs.append(" ".join(sentences))
+    return "\n\n".join(paragraphs)
+
+
+def generate_memos(count, seed=DEFAULT_SEED):
+    """Yield (memo_number, title, content, date) for memos 1..count, oldest first."""
+    rng = random.Random(seed)
+    span_days = max(365, min(count, 20 * 365))
+    first = LAST_DATE - timedelta(days=span_days)
+    for number in range(1, count + 1):
+        day = first + timedelta(days=span_days * (number - 1) / count)
+        date = day.replace(hour=rng.randint(5, 23), minute=rng.randint(0, 59), second=0, microsecond=0)
+        yield number, make_title(rng), make_content(rng), date
+
+
+def count_memos():
+    from sqlalchemy import func, select
+    from backend.api.database import engine
+    from backend.api.models import Memo
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(Memo)).scalar_one()
+
+
+def clear_memos():
+    from sqlalchemy import delete
+    from backend.api.database import engine
+    from backend.api.models import Memo, MemoMonthStats
+    with engine.begin() as connection:
+        connection.execute(delete(Memo))
+        connection.execute(delete(MemoMonthStats))
+
+
+def seed_database(count, seed=DEFAULT_SEED, verbose=True):
+    """Create the schema and insert ``count`` synthetic memos into an empty database."""
+    from sqlalchemy import insert
+    from backend.api.aggregates import memo_delta
+    from backend.api.database import engine, init_db
+    from backend.api.models import Memo, MemoMonthStats
+    from backend.api.numbering import init_memo_numbering
+
+    init_db()
+    start = time.perf_counter()
+    totals = defaultdict(lambda: [0, 0, 0])
+    batch = []
+
+    def flush():
+        with engine.begin() as connection:
+            connection.execute(insert(Memo), batch)
+        batch.clear()
+
+    for number, title, content, date in generate_memos(count, seed):
+        now = datetime.utcnow()
+        batch.append({
+            "memo_number": number,
+            "title": title,
+            "content": content,
+            "date": date,
+            "created_at": now,
+            "updated_at": now
+        })
+        memo_delta(totals, date, content)
+        if len(batch) >= BATCH_SIZE:
+            flush()
+            if verbose:
+                print(f"   {number}/{count} memos", end="\r", flush=True)
+    if batch:
+        flush()
+
+    with engine.begin() as connection:
+        connection.execute(insert(MemoMonthStats), [
+            {"year": year, "month": month, "memo_count": c, "word_count": w, "char_count": n}
+            for (year, month), (c, w, n) in totals.items()
+        ])
+        # Move the memo number allocator past the seeded numbers
+        init_memo_numbering(connection)
+
+    if verbose:
+        print(f"\r✅ Seeded {count} memos in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a database with synthetic memos")
+    parser.add_argument("--memos", type=int, default=SIZES[0], help="Number of memos (e.g. 1000, 10000, 100000)")
+    parser.add_argument("--database-url", help="Target database (default: DATABASE_URL)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed")
+    parser.add_argument("--reseed", action="store_true", help="Delete existing memos first")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    # Batched inserts trip the slow query warning
+    logging.getLogger("backend").setLevel(logging.ERROR)
+    from backend.api.database import init_db
+    init_db()
+
+    existing = count_memos()
+    if existing and not args.reseed:
+        print(f"❌ Database already has {existing} memos; pass --reseed to replace them")
+        sys.exit(1)
+    if existing:
+        clear_memos()
+    seed_database(args.memos, args.seed)
+
+
+if __name__ == "__main__":
+    main()
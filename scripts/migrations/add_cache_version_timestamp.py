@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+One-off migration: add cache_versions.updated_at to an existing database.
+
+The column records when memos were last written (deletes included) and
+backs the Last-Modified header of listing, nav and stats responses.
+Databases whose cache_versions table was created before the column
+existed need this once; new databases get it from init_db. Safe to run
+more than once.
+
+Usage:
+    export DATABASE_URL="postgres://..."   # or leave unset for the local SQLite file
+    python3 scripts/migrations/add_cache_version_timestamp.py
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path to import backend modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from sqlalchemy import inspect, text
+from backend.api.database import engine
+
+
+def main():
+    inspector = inspect(engine)
+    if not inspector.has_table("cache_versions"):
+        print("ℹ️  No cache_versions table yet; init_db will create it with updated_at")
+        return
+    columns = {column["name"] for column in inspector.get_columns("cache_versions")}
+    if "updated_at" in columns:
+        print("✅ cache_versions.updated_at already exists")
+        return
+    # TIMESTAMP is what SQLAlchemy's DateTime maps to on PostgreSQL; SQLite accepts it as-is
+    column_type = "DATETIME" if engine.dialect.name == "sqlite" else "TIMESTAMP WITHOUT TIME ZONE"
+    with engine.begin() as connection:
+        connection.execute(text(f"ALTER TABLE cache_versions ADD COLUMN updated_at {column_type}"))
+    print("✅ Added cache_versions.updated_at")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ from bs4 import BeautifulSoup
 import requests
 
 API_BASE_URL = os.getenv('API_BASE_URL', 'https://conquest-of-infinity.onrender.com')
+# JWT from POST /api/login (bulk import requires authentication)
+API_TOKEN = os.getenv('API_TOKEN', '')
 
 # Find backup archive
 BACKUP_PATTERN = "memos_backup_*.tar.gz"
@@ -75,28 +77,20 @@ def extract_content_from_html(html_content):
     
     return title, date, content
 
-def add_memo_to_api(memo_num, title, date, content):
-    """Add a memo to the Render API."""
-    url = f"{API_BASE_URL}/api/memos"
-    payload = {
-        "memo_number": memo_num,
-        "title": title,
-        "content": content,
-        "date": date.isoformat()
-    }
+def add_memos_bulk(memos):
+    """Add all memos to the Render API in one bulk request (existing numbers are skipped)."""
+    url = f"{API_BASE_URL}/api/memos/bulk"
+    headers = {"Authorization": f"Bearer {API_TOKEN}"} if API_TOKEN else {}
     
     try:
-        response = requests.post(url, json=payload, timeout=60)
-        if response.status_code in (200, 201):  # 200 OK or 201 Created
-            return True, None
-        elif response.status_code == 409 or "already exists" in response.text.lower() or "duplicate" in response.text.lower():
-            return False, "already exists"
-        else:
-            return False, f"Status {response.status_code}: {response.text[:100]}"
+        response = requests.post(url, json=memos, headers=headers, timeout=300)
+        if response.status_code == 200:
+            return response.json()["results"], None
+        return None, f"Status {response.status_code}: {response.text[:300]}"
     except requests.exceptions.Timeout:
-        return False, "timeout - server might be sleeping"
+        return None, "timeout - server might be sleeping"
     except Exception as e:
-        return False, str(e)
+        return None, str(e)
 
 def migrate_from_backup():
     """Migrate memos from backup archive to Render API."""
@@ -175,9 +169,8 @@ def migrate_from_backup():
             print("   ⚠️  No memo files found in archive")
             return
         
-        # Migrate each memo
-        migrated = 0
-        skipped = 0
+        # Parse every memo, then import them all in one bulk request
+        payload = []
         failed = 0
         
         print("4. Migrating memos...\n")
@@ -188,24 +181,34 @@ def migrate_from_backup():
                     html_content = f.read()
                 
                 title, date, content = extract_content_from_html(html_content)
-                
-                # Add to API
-                success, error = add_memo_to_api(memo_num, title, date, content)
-                
-                if success:
-                    print(f"   ✅ Memo #{memo_num}: {title[:50]}...")
-                    migrated += 1
-                elif "already exists" in str(error).lower() or "duplicate" in str(error).lower():
-                    print(f"   ⏭️  Memo #{memo_num}: Already exists, skipping...")
-                    skipped += 1
-                else:
-                    print(f"   ❌ Memo #{memo_num}: Failed - {error}")
-                    failed += 1
-                    
+                payload.append({
+                    "memo_number": memo_num,
+                    "title": title,
+                    "content": content,
+                    "date": date.isoformat()
+                })
             except Exception as e:
                 print(f"   ❌ Memo #{memo_num}: Error - {e}")
                 failed += 1
         
+        results, error = add_memos_bulk(payload)
+        if error:
+            print(f"   ❌ Bulk import failed - {error}")
+            failed += len(payload)
+            results = []
+        
+        titles = {memo["memo_number"]: memo["title"] for memo in payload}
+        migrated = 0
+        skipped = 0
+        for result in results:
+            memo_num = result["memo_number"]
+            if result["status"] == "skipped":
+                print(f"   ⏭️  Memo #{memo_num}: Already exists, skipping...")
+                skipped += 1
+            else:
+                print(f"   ✅ Memo #{memo_num}: {titles[memo_num][:50]}...")
+                migrated += 1
+        
         # Summary
         print(f"\n📊 Migration Summary:")
         print(f"   ✅ Migrated: {migrated}")
@@ -0,0 +1,50 @@
+"""
+Shared fixtures: the app runs in-process against a throwaway SQLite file.
+
+Configuration is read when the backend is imported, so the environment is
+set up here before anything from backend is imported.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+_tmp = tempfile.mkdtemp(prefix="digital-diary-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["METRICS_DIR"] = os.path.join(_tmp, "metrics")
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["LOGIN_RATE_LIMIT_ENABLED"] = "false"
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx
+import pytest
+
+from backend.config import ADMIN_PASSWORD, ADMIN_USERNAME
+from backend.main import app
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    """HTTP client for the app, with startup/shutdown run around the test."""
+    await app.router.startup()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+            yield c
+    finally:
+        await app.router.shutdown()
+
+
+@pytest.fixture
+async def auth_headers(client):
+    """Authorization header for the admin account."""
+    response = await client.post("/api/login", json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
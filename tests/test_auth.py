@@ -0,0 +1,40 @@
+"""
+ADMIN_USERNAME/ADMIN_PASSWORD are the only credentials: renaming the
+admin ends the old login and the sessions issued to it.
+"""
+import pytest
+
+from backend.api import users
+from backend.api.database import AsyncSessionLocal, engine
+from backend.api.revocation import sync_revocations
+from backend.config import ADMIN_PASSWORD, ADMIN_USERNAME
+
+pytestmark = pytest.mark.anyio
+
+
+async def restart_with_admin(username):
+    """What a worker does on startup with ADMIN_USERNAME=username."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(users, "ADMIN_USERNAME", username)
+        users.ensure_admin_user(engine)
+    async with AsyncSessionLocal() as db:
+        await sync_revocations(db)
+
+
+async def login(client, username):
+    return await client.post("/api/login", json={"username": username, "password": ADMIN_PASSWORD})
+
+
+async def test_renamed_admin_ends_old_login_and_sessions(client, auth_headers):
+    assert (await client.get("/api/me", headers=auth_headers)).status_code == 200
+    try:
+        await restart_with_admin("alice")
+        assert (await client.get("/api/me", headers=auth_headers)).status_code == 401
+        assert (await login(client, ADMIN_USERNAME)).status_code == 401
+        renamed = await login(client, "alice")
+        assert renamed.status_code == 200
+        headers = {"Authorization": f"Bearer {renamed.json()['access_token']}"}
+        assert (await client.get("/api/me", headers=headers)).json()["username"] == "alice"
+    finally:
+        await restart_with_admin(ADMIN_USERNAME)
+    assert (await login(client, ADMIN_USERNAME)).status_code == 200
@@ -0,0 +1,49 @@
+"""
+Compressed responses and their revalidation keep per-encoding validators.
+"""
+import pytest
+
+from backend.api.compression import brotli
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("encoding", [
+    pytest.param("br", marks=pytest.mark.skipif(brotli is None, reason="Brotli not installed")),
+    "gzip",
+])
+async def test_not_modified_keeps_encoded_etag_and_vary(client, auth_headers, encoding):
+    for day in range(1, 6):
+        response = await client.post(
+            "/api/memos", json={"title": "t", "content": "words " * 200, "date": f"2022-02-0{day}"},
+            headers=auth_headers
+        )
+        assert response.status_code == 201
+
+    full = await client.get("/api/memos", headers={"Accept-Encoding": encoding})
+    assert full.status_code == 200
+    assert full.headers["content-encoding"] == encoding
+    etag = full.headers["etag"]
+    assert etag.endswith(f'-{encoding}"')
+    assert "Accept-Encoding" in full.headers["vary"]
+
+    revalidated = await client.get(
+        "/api/memos", headers={"Accept-Encoding": encoding, "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert "Accept-Encoding" in revalidated.headers["vary"]
+    assert "content-encoding" not in revalidated.headers
+
+
+async def test_not_modified_keeps_identity_etag_of_small_body(client):
+    small = await client.get("/api/memos?limit=0", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    etag = small.headers["etag"]
+
+    revalidated = await client.get(
+        "/api/memos?limit=0", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert "Accept-Encoding" in revalidated.headers["vary"]
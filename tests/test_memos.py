@@ -0,0 +1,51 @@
+"""
+Memo writes reject malformed fields with 400 before anything is stored.
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("memo_number", ["abc", -7, 0, True, 1.5])
+async def test_create_rejects_invalid_memo_number(client, auth_headers, memo_number):
+    response = await client.post(
+        "/api/memos",
+        json={"memo_number": memo_number, "title": "t", "content": "c", "date": "2024-01-01"},
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "memo_number must be a positive integer"
+    # Nothing was stored that would break later reads
+    assert (await client.get("/api/memos")).status_code == 200
+    assert (await client.get("/api/memos/export", headers=auth_headers)).status_code == 200
+
+
+async def test_create_accepts_explicit_memo_number(client, auth_headers):
+    response = await client.post(
+        "/api/memos",
+        json={"memo_number": 4242, "title": "t", "content": "c", "date": "2024-01-01"},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    assert response.json()["memo_number"] == 4242
+
+
+@pytest.mark.parametrize("body, detail", [
+    ({"title": None}, "title must be a string"),
+    ({"title": 5}, "title must be a string"),
+    ({"title": "x" * 501}, "title must be at most 500 characters"),
+    ({"content": ["c"]}, "content must be a string"),
+    ({"date": "someday"}, "Invalid date format"),
+    ({"date": 12345}, "Invalid date format"),
+])
+async def test_update_rejects_invalid_fields(client, auth_headers, body, detail):
+    created = await client.post(
+        "/api/memos", json={"title": "before", "content": "c", "date": "2024-01-01"}, headers=auth_headers
+    )
+    memo_number = created.json()["memo_number"]
+
+    response = await client.put(f"/api/memos/{memo_number}", json=body, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+    memo = (await client.get(f"/api/memos/{memo_number}")).json()
+    assert (memo["title"], memo["content"]) == ("before", "c")
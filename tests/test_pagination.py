@@ -0,0 +1,45 @@
+"""
+Keyset pagination: cursor pages match the full listing, and the seek is
+an index range rather than a scan, so deep pages cost the same as the first.
+"""
+from datetime import datetime
+
+import pytest
+
+from backend.api.database import engine
+from backend.api.pagination import encode_cursor
+from backend.api.routes.memos import build_listing_query
+
+pytestmark = pytest.mark.anyio
+
+
+def query_plan(statement):
+    compiled = statement.compile(dialect=engine.dialect)
+    parameters = tuple(compiled.construct_params()[name] for name in compiled.positiontup)
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), parameters).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_seek_uses_index_range(client, order):
+    plan = query_plan(build_listing_query(order, encode_cursor(datetime(2024, 1, 1), 10), "full", 0).limit(20))
+    assert any(step.startswith("SEARCH memos USING") and "(date,memo_number)" in step for step in plan), plan
+    assert not any(step.startswith("SCAN memos") for step in plan), plan
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_cursor_pages_follow_listing(client, auth_headers, order):
+    for day in (3, 1, 2, 2, 1):
+        response = await client.post(
+            "/api/memos", json={"title": "t", "content": "c", "date": f"2023-05-0{day}"}, headers=auth_headers
+        )
+        assert response.status_code == 201
+
+    everything = [m["memo_number"] for m in (await client.get(f"/api/memos?order={order}&limit=1000")).json()]
+    paged, cursor = [], ""
+    while cursor is not None:
+        response = await client.get(f"/api/memos?order={order}&limit=2&cursor={cursor}")
+        paged += [m["memo_number"] for m in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+    assert paged == everything